@@ -9,6 +9,10 @@ from dotenv import load_dotenv
 import asyncio
 from time import monotonic
 
+from utils.logging import setup_logging
+from utils import discord_cache
+from utils.global_cooldown import is_admin_user
+
 # --- Load environment variables ---
 load_dotenv()
 TOKEN = os.getenv("DISCORD_TOKEN")
@@ -16,6 +20,9 @@ GUILD_ID = int(os.getenv("GUILD_ID"))
 ADMINS_ROLE_ID = int(os.getenv("ADMINS_ROLE_ID", 0))
 CAPTAINS_ROLE_ID = int(os.getenv("CAPTAINS_ROLE_ID", 0))
 
+# --- Logging (cogs log to "qrls.*" and propagate here) ---
+setup_logging()
+
 # --- Discord bot setup ---
 intents = discord.Intents.default()
 intents.members = True
@@ -28,16 +35,6 @@ bot = commands.Bot(command_prefix="!", intents=intents)
 THROTTLE_SECONDS = 8.0
 _last_use_by_user: dict[int, float] = {}
 
-def is_admin_user(interaction: discord.Interaction) -> bool:
-    """Admins include anyone with Admin role ID or Administrator permission."""
-    if not interaction.guild:
-        return False
-    if getattr(interaction.user, "guild_permissions", None) and interaction.user.guild_permissions.administrator:
-        return True
-    if ADMINS_ROLE_ID and discord.utils.get(interaction.user.roles, id=ADMINS_ROLE_ID):
-        return True
-    return False
-
 
 @bot.event
 async def on_interaction(interaction: discord.Interaction):
@@ -50,7 +47,7 @@ async def on_interaction(interaction: discord.Interaction):
         return await bot.process_application_commands(interaction)
 
     # Skip admins entirely
-    if is_admin_user(interaction):
+    if is_admin_user(interaction.user):
         return await bot.process_application_commands(interaction)
 
     uid = interaction.user.id
@@ -107,6 +104,10 @@ async def on_app_command_error(interaction: discord.Interaction, error):
             )
         return
 
+    # Check failures a command already answered (e.g. /propose's own error handler) need no second message
+    if isinstance(error, app_commands.CheckFailure) and interaction.response.is_done():
+        return
+
     try:
         await interaction.response.send_message(
             "⚠️ An unexpected error occurred while running this command.",
@@ -124,6 +125,7 @@ async def on_app_command_error(interaction: discord.Interaction, error):
 # ================================================================
 async def main():
     async with bot:
+        discord_cache.register(bot)
         for cog_name in [
             "cogs.startweek",
             "cogs.clearschedule",
@@ -1,6 +1,5 @@
 import os
 import json
-import logging
 import traceback
 from typing import Optional
 
@@ -13,17 +12,12 @@ import gspread
 from google.oauth2.service_account import Credentials
 
 from utils.team_info import TEAM_INFO
+from utils.logging import get_logger
 
 
 load_dotenv()
 
-logger = logging.getLogger("qrls.add")
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] %(name)s: %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-logger.setLevel(logging.INFO)
+logger = get_logger("qrls.add")
 
 
 def _get_env_int(name: str) -> Optional[int]:
@@ -394,6 +388,7 @@ class Add(commands.Cog):
 
                 # ✅ Apply change: Column D (4th col) to captain team
                 ws.update_cell(player_row, self.cog.COL_TEAM + 1, captain_team_current)
+                self.cog.bot.dispatch("roster_sheet_updated")
 
                 # ✅ After sheet update: update Discord roles (remove Free Agent, add team role)
                 role_ok, role_msg = await self.cog._apply_discord_roles_after_approval(
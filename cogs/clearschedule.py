@@ -3,6 +3,8 @@ import discord
 from discord import app_commands, Interaction
 from discord.ext import commands
 from typing import Optional
+from utils.permissions import member_role_ids
+from utils.discord_cache import categories_by_name
 from dotenv import load_dotenv
 
 # ✅ Load environment variables
@@ -81,10 +83,12 @@ class ClearSchedule(commands.Cog):
 
         if member.guild_permissions.administrator:
             has_permission = True
-        elif ADMINS_ROLE_ID and discord.utils.get(member.roles, id=ADMINS_ROLE_ID):
-            has_permission = True
-        elif CAPTAINS_ROLE_ID and discord.utils.get(member.roles, id=CAPTAINS_ROLE_ID):
-            has_permission = True
+        else:
+            role_ids = member_role_ids(member)
+            if ADMINS_ROLE_ID and ADMINS_ROLE_ID in role_ids:
+                has_permission = True
+            elif CAPTAINS_ROLE_ID and CAPTAINS_ROLE_ID in role_ids:
+                has_permission = True
 
         if not has_permission:
             await interaction.response.send_message(
@@ -96,7 +100,7 @@ class ClearSchedule(commands.Cog):
         await interaction.response.defer(ephemeral=True)
 
         guild = interaction.guild
-        category = discord.utils.get(guild.categories, name="╭────Scheduling────╮")
+        category = categories_by_name(guild).get("╭────Scheduling────╮")
 
         if not category:
             await interaction.followup.send("❌ No 'Scheduling Channel' category found.", ephemeral=True)
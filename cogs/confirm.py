@@ -1,4 +1,3 @@
-import json
 import os
 from typing import Optional
 from datetime import datetime, timedelta
@@ -9,6 +8,9 @@ import discord
 from discord import app_commands, Interaction
 from discord.ext import commands
 from utils.team_info import TEAM_INFO
+from utils.permissions import member_role_ids
+from utils.discord_cache import roles_by_name, text_channels_by_name
+from utils.proposals import proposals
 from dotenv import load_dotenv
 
 # ✅ Load environment variables
@@ -17,8 +19,6 @@ ADMINS_ROLE_ID = int(os.getenv("ADMINS_ROLE_ID", 0))
 CAPTAINS_ROLE_ID = int(os.getenv("CAPTAINS_ROLE_ID", 0))
 SCHED_CATEGORY_ID = int(os.getenv("SCHED_CATEGORY_ID", 0))
 
-DATA_DIR = "data"
-PROPOSALS_FILE = os.path.join(DATA_DIR, "proposals.json")
 SCHED_CATEGORY_NAME = "Scheduling Channel"
 SCHED_RESULTS_CHANNEL = "💥・scheduling"
 SCHEDULED_MATCHES_CHANNEL = "📜・scheduled-matches"
@@ -30,28 +30,13 @@ DATE_RE = re.compile(r"^\s*(\d{1,2})/(\d{1,2})\s*$")  # M/D or MM/DD
 TIME_RE = re.compile(r"^\s*(1[0-2]|0?[1-9])(?:\:([0-5]\d))?\s*([ap]m)\s*$", re.IGNORECASE)
 
 
-def load_proposals() -> dict:
-    if not os.path.exists(PROPOSALS_FILE):
-        return {}
-    with open(PROPOSALS_FILE, "r", encoding="utf-8") as f:
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            return {}
-
-
-def save_proposals(data: dict):
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(PROPOSALS_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
-
-
 def user_is_admin_or_captain(member: discord.Member) -> bool:
     if member.guild_permissions.administrator:
         return True
-    if ADMINS_ROLE_ID and discord.utils.get(member.roles, id=ADMINS_ROLE_ID):
+    role_ids = member_role_ids(member)
+    if ADMINS_ROLE_ID and ADMINS_ROLE_ID in role_ids:
         return True
-    if CAPTAINS_ROLE_ID and discord.utils.get(member.roles, id=CAPTAINS_ROLE_ID):
+    if CAPTAINS_ROLE_ID and CAPTAINS_ROLE_ID in role_ids:
         return True
     return False
 
@@ -113,6 +98,12 @@ class Confirm(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def cog_load(self):
+        await proposals.start()
+
+    async def cog_unload(self):
+        await proposals.stop()
+
     async def _check_permissions_and_location(self, interaction: Interaction) -> Optional[str]:
         if not interaction.channel or not isinstance(interaction.channel, discord.TextChannel):
             return "❌ This command must be used in a text channel."
@@ -156,14 +147,11 @@ class Confirm(commands.Cog):
             await interaction.followup.send(parse_err)
             return
 
-        proposals = load_proposals()
-        ch_id = str(interaction.channel.id)
-
-        if ch_id not in proposals:
+        proposal = proposals.get(interaction.channel.id)
+        if proposal is None:
             await interaction.followup.send("❌ No active proposal found in this channel.")
             return
 
-        proposal = proposals[ch_id]
         proposer_id = proposal.get("proposer_id")
 
         proposed_iso = proposal.get("dt_iso")
@@ -212,7 +200,7 @@ class Confirm(commands.Cog):
         # --- Determine confirmer's role (Admin or Captain) ---
         if interaction.user.guild_permissions.administrator:
             role_label = "Admin"
-        elif CAPTAINS_ROLE_ID and discord.utils.get(interaction.user.roles, id=CAPTAINS_ROLE_ID):
+        elif CAPTAINS_ROLE_ID and CAPTAINS_ROLE_ID in member_role_ids(interaction.user):
             role_label = "Captain"
         else:
             role_label = "Member"
@@ -250,11 +238,13 @@ class Confirm(commands.Cog):
         await interaction.followup.send(embed=embed, allowed_mentions=allowed_mentions, ephemeral=False)
 
         # --- Post to both #💥・scheduling and #scheduled-matches ---
-        sched_channel = discord.utils.get(interaction.guild.text_channels, name=SCHED_RESULTS_CHANNEL)
-        scheduled_matches_channel = discord.utils.get(interaction.guild.text_channels, name=SCHEDULED_MATCHES_CHANNEL)
+        guild_channels = text_channels_by_name(interaction.guild)
+        sched_channel = guild_channels.get(SCHED_RESULTS_CHANNEL)
+        scheduled_matches_channel = guild_channels.get(SCHEDULED_MATCHES_CHANNEL)
 
-        role_a = discord.utils.get(interaction.guild.roles, name=team_a)
-        role_b = discord.utils.get(interaction.guild.roles, name=team_b)
+        guild_roles = roles_by_name(interaction.guild)
+        role_a = guild_roles.get(team_a)
+        role_b = guild_roles.get(team_b)
         team_a_mention = role_a.mention if role_a else f"@{team_a}"
         team_b_mention = role_b.mention if role_b else f"@{team_b}"
 
@@ -281,8 +271,7 @@ class Confirm(commands.Cog):
                         print(f"⚠️ Failed to add reactions in {channel.name}: {e}")
 
         # --- Cleanup proposal record ---
-        del proposals[ch_id]
-        save_proposals(proposals)
+        proposals.pop(interaction.channel.id)
 
     @confirm.error
     async def confirm_error(self, interaction: Interaction, error):
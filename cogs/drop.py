@@ -1,30 +1,25 @@
 import os
 import json
-import logging
-import traceback
+import asyncio
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta, timezone
 
 import discord
 from discord import app_commands, Interaction
 from discord.ext import commands
-from dotenv import load_dotenv
 
 import gspread
+from google.auth.transport.requests import AuthorizedSession
 from google.oauth2.service_account import Credentials
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from utils.team_info import TEAM_INFO
+from utils.permissions import member_role_ids
+from utils.team_info import TEAM_ROLE_IDS, get_team_role_id
+from utils.logging import get_logger
 
 
-load_dotenv()
-
-logger = logging.getLogger("qrls.drop")
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] %(name)s: %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-logger.setLevel(logging.INFO)
+logger = get_logger("qrls.drop")
 
 
 DATA_DIR = "data"
@@ -45,29 +40,14 @@ def _normalize(s: str) -> str:
     return (s or "").strip()
 
 
-def _get_team_role_id(team_name: str) -> Optional[int]:
-    info = TEAM_INFO.get(team_name)
-    if not isinstance(info, dict):
-        return None
-    role_id = info.get("id")
-    if isinstance(role_id, int):
-        return role_id
-    if isinstance(role_id, str) and role_id.isdigit():
-        return int(role_id)
-    return None
+def _first_cell(value_range: list[list[str]]) -> str:
+    return value_range[0][0] if value_range and value_range[0] else ""
 
 
 def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def _parse_iso_dt(value: str) -> Optional[datetime]:
-    try:
-        return datetime.fromisoformat(value)
-    except Exception:
-        return None
-
-
 class Drop(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
@@ -84,34 +64,54 @@ class Drop(commands.Cog):
         self.waivers_role_id = _get_env_int("WAIVERS_ROLE_ID")
 
         self.sa_json = os.getenv("GOOGLE_SERVICE_ACCOUNT_JSON", "")
+        self._sa_info: Optional[Dict[str, Any]] = None
+        self._sa_path: Optional[str] = None
+        sa_val = self.sa_json.strip()
+        if sa_val.startswith("{"):
+            try:
+                self._sa_info = json.loads(sa_val)
+            except ValueError:
+                logger.error("GOOGLE_SERVICE_ACCOUNT_JSON looks like json but could not be parsed.")
+        elif sa_val:
+            self._sa_path = sa_val
         self.sheet_id = os.getenv("GOOGLE_SHEET_ID", "")
         self.worksheet_name = os.getenv("GOOGLE_WORKSHEET", "")
 
+        # Built lazily; one keep-alive HTTP session is reused for every sheet call
+        self._gs_session: Optional[AuthorizedSession] = None
+        self._gc: Optional[gspread.Client] = None
+
         # Sheet columns: A=Discord ID, D=Team
         self.COL_DISCORD_ID = 0
         self.COL_TEAM = 3
 
         os.makedirs(DATA_DIR, exist_ok=True)
 
+    def cog_unload(self):
+        if self._gs_session is not None:
+            self._gs_session.close()
+        self._gs_session = None
+        self._gc = None
+
     # ---------------------------
     # Helpers
     # ---------------------------
-    def _has_role_id(self, member: discord.Member, role_id: int) -> bool:
-        return any(r.id == role_id for r in member.roles)
-
     def _is_admin_member(self, member: discord.Member) -> bool:
-        if getattr(member.guild_permissions, "administrator", False):
+        if member.guild_permissions.administrator:
             return True
-        if self.admins_role_id and self._has_role_id(member, self.admins_role_id):
-            return True
-        return False
+        return bool(self.admins_role_id) and self.admins_role_id in member_role_ids(member)
 
     def _get_gspread_client(self) -> gspread.Client:
         """
         Supports GOOGLE_SERVICE_ACCOUNT_JSON as:
         - a file path, OR
         - raw json content (string starting with '{')
+
+        The client (and its pooled HTTP session) is built once and reused.
         """
+        if self._gc is not None:
+            return self._gc
+
         if not self.sa_json:
             raise RuntimeError("GOOGLE_SERVICE_ACCOUNT_JSON is missing from .env")
 
@@ -120,16 +120,25 @@ class Drop(commands.Cog):
             "https://www.googleapis.com/auth/drive",
         ]
 
-        sa_val = self.sa_json.strip()
-        if sa_val.startswith("{"):
-            info = json.loads(sa_val)
-            creds = Credentials.from_service_account_info(info, scopes=scopes)
-            return gspread.authorize(creds)
+        if self._sa_info is not None:
+            creds = Credentials.from_service_account_info(self._sa_info, scopes=scopes)
+        elif self._sa_path is not None:
+            if not os.path.exists(self._sa_path):
+                raise RuntimeError(f"Service account json not found at path: {self._sa_path}")
+            creds = Credentials.from_service_account_file(self._sa_path, scopes=scopes)
+        else:
+            raise RuntimeError("GOOGLE_SERVICE_ACCOUNT_JSON is not valid json")
 
-        if not os.path.exists(sa_val):
-            raise RuntimeError(f"Service account json not found at path: {sa_val}")
+        session = AuthorizedSession(creds)
+        retry = Retry(total=3, backoff_factor=0.25, status_forcelist=[429, 500, 502, 503, 504])
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
 
-        return gspread.service_account(filename=sa_val)
+        # gspread 6 keeps the HTTP session on the client's HTTPClient
+        gc = gspread.Client(auth=creds)
+        gc.http_client.session = session
+        self._gs_session = session
+        self._gc = gc
+        return self._gc
 
     def _open_worksheet(self):
         if not self.sheet_id:
@@ -156,6 +165,30 @@ class Drop(commands.Cog):
         row = values[row_index_1based - 1]
         return _normalize(row[self.COL_TEAM]) if len(row) > self.COL_TEAM else ""
 
+    def _read_request_rows(self, ws, rows: Dict[int, int]) -> Optional[list[list[str]]]:
+        """
+        Re-read only the Discord ID and Team cells for {row_index: discord_id} in one batchGet.
+        Returns a sparse values list usable with the row helpers above,
+        or None if any row no longer holds the expected Discord ID.
+        """
+        items = list(rows.items())
+        ranges = []
+        for row_index, _ in items:
+            ranges.append(gspread.utils.rowcol_to_a1(row_index, self.COL_DISCORD_ID + 1))
+            ranges.append(gspread.utils.rowcol_to_a1(row_index, self.COL_TEAM + 1))
+        results = ws.batch_get(ranges)
+
+        values: list[list[str]] = [[] for _ in range(max(rows))]
+        for n, (row_index, discord_id) in enumerate(items):
+            cell_id = _first_cell(results[2 * n])
+            if _normalize(cell_id) != str(discord_id):
+                return None
+            row = [""] * (self.COL_TEAM + 1)
+            row[self.COL_DISCORD_ID] = cell_id
+            row[self.COL_TEAM] = _first_cell(results[2 * n + 1])
+            values[row_index - 1] = row
+        return values
+
     async def _post_in_origin_channel(self, origin_channel_id: int, message: str):
         ch = self.bot.get_channel(origin_channel_id)
         if isinstance(ch, discord.TextChannel):
@@ -181,7 +214,7 @@ class Drop(commands.Cog):
             logger.warning("TRANSACTIONS_CHANNEL_ID does not resolve to a text channel; skipping.")
             return
 
-        team_role_id = _get_team_role_id(team_name)
+        team_role_id = get_team_role_id(team_name)
         if team_role_id:
             team_text = f"<@&{team_role_id}>"
         else:
@@ -220,22 +253,23 @@ class Drop(commands.Cog):
         self,
         guild_id: int,
         player_id: int,
-        requested_at_iso: str,
-        expires_at_iso: str,
+        requested_at_ts: int,
+        expires_at_ts: int,
         original_team: str,
         dropped_by_id: int,
     ) -> None:
         """
         Create/overwrite the waiver record for this player.
         Note: waiverclaim.py will own expiry + claim logic, so we only store timing + origin team.
+        Timestamps are stored as epoch seconds (UTC).
         """
         data = self._load_waivers_json()
         key = str(player_id)
         data[key] = {
             "guild_id": guild_id,
             "player_id": player_id,
-            "requested_at": requested_at_iso,
-            "expires_at": expires_at_iso,
+            "requested_at": requested_at_ts,
+            "expires_at": expires_at_ts,
             "original_team": original_team,
             "dropped_by_id": dropped_by_id,
 
@@ -259,8 +293,8 @@ class Drop(commands.Cog):
         Returns (ok, message).
         """
         try:
-            free_agent_role_id = _get_team_role_id("Free Agent")
-            team_role_id = _get_team_role_id(team_name)
+            free_agent_role_id = TEAM_ROLE_IDS.get("Free Agent")
+            team_role_id = get_team_role_id(team_name)
 
             if not free_agent_role_id:
                 return False, "Free Agent role ID is missing/invalid in TEAM_INFO."
@@ -321,9 +355,8 @@ class Drop(commands.Cog):
             return False, "Bot lacks permission to manage roles (or role hierarchy prevents it)."
         except discord.NotFound:
             return False, "Player not found in the server when attempting role update."
-        except Exception as e:
-            logger.error("Role update failed: %r", e)
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Role update failed")
             return False, "Unexpected error while updating roles (see console)."
 
     # ---------------------------
@@ -336,18 +369,22 @@ class Drop(commands.Cog):
             origin_channel_id: int,
             captain_id: int,
             captain_team: str,
+            captain_row_index: int,
             player_id: int,
+            player_row_index: int,
             player_display: str,
-            requested_at_iso: str,
+            requested_at_ts: int,
         ):
             super().__init__(timeout=60 * 60 * 24)  # 24 hour timeout
             self.cog = cog
             self.origin_channel_id = origin_channel_id
             self.captain_id = captain_id
             self.captain_team = captain_team
+            self.captain_row_index = captain_row_index
             self.player_id = player_id
+            self.player_row_index = player_row_index
             self.player_display = player_display
-            self.requested_at_iso = requested_at_iso
+            self.requested_at_ts = requested_at_ts
             self.decided = False
 
         async def _finalize_buttons(self, interaction: discord.Interaction, status_text: str):
@@ -394,8 +431,16 @@ class Drop(commands.Cog):
                 pass
 
             try:
-                ws = self.cog._open_worksheet()
-                values = ws.get_all_values()
+                # gspread calls block (and may back off on retries), so they run in a worker thread
+                ws = await asyncio.to_thread(self.cog._open_worksheet)
+                values = await asyncio.to_thread(
+                    self.cog._read_request_rows,
+                    ws,
+                    {self.captain_row_index: self.captain_id, self.player_row_index: self.player_id}
+                )
+                if values is None:
+                    # Rows moved since /drop was filed; fall back to a full read
+                    values = await asyncio.to_thread(ws.get_all_values)
 
                 captain_row = self.cog._find_row_index_by_discord_id(values, self.captain_id)
                 if not captain_row:
@@ -453,11 +498,13 @@ class Drop(commands.Cog):
                     await self._finalize_buttons(interaction, "❌ Approval failed (player not on captain team).")
                     return
 
-                requested_at = _parse_iso_dt(self.requested_at_iso) or _utc_now()
+                requested_at = datetime.fromtimestamp(self.requested_at_ts, tz=timezone.utc)
                 expires_at = requested_at + timedelta(days=2)
+                expires_at_ts = int(expires_at.timestamp())
 
                 # Sheet: set to Waivers
-                ws.update_cell(player_row, self.cog.COL_TEAM + 1, "Waivers")
+                await asyncio.to_thread(ws.update_cell, player_row, self.cog.COL_TEAM + 1, "Waivers")
+                self.cog.bot.dispatch("roster_sheet_updated")
 
                 # Roles: remove team role, add Free Agent + Waivers
                 role_ok, role_msg = await self.cog._apply_discord_roles_after_approval(
@@ -471,14 +518,13 @@ class Drop(commands.Cog):
                     self.cog._record_waiver(
                         guild_id=interaction.guild.id,
                         player_id=self.player_id,
-                        requested_at_iso=requested_at.isoformat(),
-                        expires_at_iso=expires_at.isoformat(),
+                        requested_at_ts=self.requested_at_ts,
+                        expires_at_ts=expires_at_ts,
                         original_team=captain_team_current,
                         dropped_by_id=self.captain_id,
                     )
-                except Exception as e:
-                    logger.error("Failed to record waiver json: %r", e)
-                    traceback.print_exc()
+                except Exception:
+                    logger.exception("Failed to record waiver json")
 
                 # Transaction log (drop)
                 player_member = None
@@ -493,16 +539,15 @@ class Drop(commands.Cog):
                         player_member=player_member,
                         player_display=self.player_display
                     )
-                except Exception as e:
-                    logger.error("Transaction log post failed: %r", e)
-                    traceback.print_exc()
+                except Exception:
+                    logger.exception("Transaction log post failed")
 
                 try:
                     await interaction.followup.send("✅ Approved and applied.", ephemeral=True)
                 except discord.HTTPException:
                     pass
 
-                expiry_text = f"<t:{int(expires_at.timestamp())}:F> (<t:{int(expires_at.timestamp())}:R>)"
+                expiry_text = f"<t:{expires_at_ts}:F> (<t:{expires_at_ts}:R>)"
 
                 if role_ok:
                     await self.cog._post_in_origin_channel(
@@ -527,9 +572,8 @@ class Drop(commands.Cog):
                         f"✅ Approved by {approver.mention} — **{self.player_display}** → **2 Day Waivers** (ends {expiry_text}, ⚠️ role issue)"
                     )
 
-            except Exception as e:
-                logger.error("Approve failed: %r", e)
-                traceback.print_exc()
+            except Exception:
+                logger.exception("Approve failed")
 
                 try:
                     await interaction.followup.send(
@@ -585,7 +629,7 @@ class Drop(commands.Cog):
             step = "DEFER"
             await interaction.response.defer(ephemeral=True)
 
-            requested_at_iso = _utc_now().isoformat()
+            requested_at = _utc_now()
 
             # --- Env validation ---
             step = "ENV_VALIDATE"
@@ -610,7 +654,7 @@ class Drop(commands.Cog):
             if not isinstance(interaction.user, discord.Member):
                 await interaction.followup.send("❌ This command must be used in a server.", ephemeral=True)
                 return
-            if not self._has_role_id(interaction.user, self.captains_role_id):
+            if self.captains_role_id not in member_role_ids(interaction.user):
                 await interaction.followup.send("🚫 Only captains can use this command.", ephemeral=True)
                 return
 
@@ -633,10 +677,10 @@ class Drop(commands.Cog):
 
             # --- Open worksheet and validate BEFORE creating pending request ---
             step = "OPEN_SHEET"
-            ws = self._open_worksheet()
+            ws = await asyncio.to_thread(self._open_worksheet)
 
             step = "READ_ALL"
-            values = ws.get_all_values()
+            values = await asyncio.to_thread(ws.get_all_values)
             if not values:
                 await interaction.followup.send("❌ Worksheet is empty.", ephemeral=True)
                 return
@@ -660,8 +704,8 @@ class Drop(commands.Cog):
                 return
 
             # Ensure TEAM_INFO has role IDs for Free Agent + captain team
-            free_agent_role_id = _get_team_role_id("Free Agent")
-            team_role_id = _get_team_role_id(captain_team)
+            free_agent_role_id = TEAM_ROLE_IDS.get("Free Agent")
+            team_role_id = get_team_role_id(captain_team)
             if not free_agent_role_id:
                 await interaction.followup.send(
                     "❌ TEAM_INFO is missing a valid role `id` for **Free Agent**.",
@@ -713,9 +757,11 @@ class Drop(commands.Cog):
                 origin_channel_id=origin_channel_id,
                 captain_id=interaction.user.id,
                 captain_team=captain_team,
+                captain_row_index=captain_row_index,
                 player_id=player1.id,
+                player_row_index=player_row_index,
                 player_display=player1.display_name,
-                requested_at_iso=requested_at_iso,
+                requested_at_ts=int(requested_at.timestamp()),
             )
 
             admins_role_mention = f"<@&{self.admins_role_id}>"
@@ -727,7 +773,7 @@ class Drop(commands.Cog):
                     f"Team (from sheet): **{captain_team}**\n"
                     f"Drop: {player1.mention}\n"
                     f"Origin channel: <#{origin_channel_id}>\n"
-                    f"Requested at (UTC): `{requested_at_iso}`"
+                    f"Requested at (UTC): `{requested_at.isoformat()}`"
                 ),
                 allowed_mentions=discord.AllowedMentions(roles=True, users=True, everyone=False),
                 view=view
@@ -735,9 +781,8 @@ class Drop(commands.Cog):
 
             await interaction.followup.send("✅ Request submitted for Admin Approval.", ephemeral=True)
 
-        except Exception as e:
-            logger.error("ERROR at step=%s: %r", step, e)
-            traceback.print_exc()
+        except Exception:
+            logger.exception("ERROR at step=%s", step)
             try:
                 await interaction.followup.send(
                     f"❌ /drop failed at step: **{step}** (check bot console for traceback).",
@@ -1,25 +1,33 @@
 import os
+from enum import IntEnum
+from types import MappingProxyType
 
 import discord
 from discord import app_commands
 from discord.ext import commands
-from dotenv import load_dotenv
 
 from utils.global_cooldown import check_cooldown
+from utils.permissions import member_role_ids
 
-# ✅ Load .env
-load_dotenv()
+# ✅ Environment variables (.env is loaded by bot.py)
 ADMINS_ROLE_ID = int(os.getenv("ADMINS_ROLE_ID", 0))
 CAPTAINS_ROLE_ID = int(os.getenv("CAPTAINS_ROLE_ID", 0))
 
-# Access levels
-ACCESS_EVERYONE = "everyone"
-ACCESS_CAPTAIN = "captain"  # captains + admins
-ACCESS_ADMIN = "admin"      # admins only
+
+# Access levels (bitmask values: a command is visible when its level & the user's mask is non-zero)
+class Access(IntEnum):
+    EVERYONE = 1
+    CAPTAIN = 2  # captains + admins
+    ADMIN = 4    # admins only
+
+
+ACCESS_EVERYONE = Access.EVERYONE
+ACCESS_CAPTAIN = Access.CAPTAIN
+ACCESS_ADMIN = Access.ADMIN
 
 # 🔧 Central place to control who should see what
 # Anything not listed here defaults to ACCESS_EVERYONE
-COMMAND_ACCESS: dict[str, str] = {
+COMMAND_ACCESS = MappingProxyType({
     # Admin-only commands
     "startweek": ACCESS_ADMIN,
     "clearschedule": ACCESS_ADMIN,
@@ -39,84 +47,90 @@ COMMAND_ACCESS: dict[str, str] = {
     "confirm": ACCESS_CAPTAIN,
     "waiverclaim": ACCESS_CAPTAIN,
     "sub": ACCESS_CAPTAIN,
-    "propose": ACCESS_CAPTAIN,
-    "confirm": ACCESS_CAPTAIN
-}
+})
+
+EMBED_DESCRIPTION_LIMIT = 4096
+
+ACCESS_ICONS = MappingProxyType({
+    ACCESS_EVERYONE: "",
+    ACCESS_CAPTAIN: "⚓ ",
+    ACCESS_ADMIN: "🔒 ",
+})
+
+
+# Visibility buckets: (user access mask, footer text)
+HELP_BUCKETS = MappingProxyType({
+    "admin": (
+        ACCESS_EVERYONE | ACCESS_CAPTAIN | ACCESS_ADMIN,
+        "You have access to all commands (including Admin-only and Captain-only).",
+    ),
+    "captain": (
+        ACCESS_EVERYONE | ACCESS_CAPTAIN,
+        "⚓ Captain access: Admin-only commands are hidden.",
+    ),
+    "everyone": (
+        int(ACCESS_EVERYONE),
+        "Only showing commands available to you.",
+    ),
+})
 
 
 class Help(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # (access mask, display name, description), pre-sorted by display name
+        self._command_index: list[tuple[int, str, str]] = []
+        # One prebuilt embed per visibility bucket
+        self._embeds: dict[str, discord.Embed] = {}
 
-    @app_commands.command(
-        name="help",
-        description="Shows the commands available to you and what they do."
-    )
-    async def help(self, interaction: discord.Interaction):
-        """Lists only the commands the user has permission to use."""
-        if not await check_cooldown(interaction):
-            return
-
-        guild = interaction.guild
-        user = interaction.user
-
-        # If it's somehow not in a guild, just bail nicely
-        if not guild or not isinstance(user, discord.Member):
-            await interaction.response.send_message(
-                "❌ This command can only be used in a server.",
-                ephemeral=True
-            )
-            return
-
-        # --- Determine user's permissions ---
-        is_admin = (
-            user.guild_permissions.administrator
-            or (ADMINS_ROLE_ID and discord.utils.get(user.roles, id=ADMINS_ROLE_ID))
-        )
-        is_captain = bool(CAPTAINS_ROLE_ID and discord.utils.get(user.roles, id=CAPTAINS_ROLE_ID))
+    async def cog_load(self):
+        self.rebuild_index()
 
-        embed = discord.Embed(
-            title="📘 QRLS Bot Command Reference",
-            color=discord.Color.blurple()
-        )
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Cogs loaded after this one have registered their commands by now
+        self.rebuild_index()
 
-        visible_commands: list[tuple[str, str]] = []
+    def rebuild_index(self):
+        """Walks the command tree once and caches what /help needs to render."""
+        index: list[tuple[int, str, str]] = []
 
         for command in self.bot.tree.get_commands():
             # Only consider top-level slash commands
             if not isinstance(command, app_commands.Command):
                 continue
 
-            cmd_name = command.name
-
             # Decide access level from map (default: everyone)
-            access = COMMAND_ACCESS.get(cmd_name, ACCESS_EVERYONE)
-
-            # --- Apply visibility rules ---
-            if access == ACCESS_ADMIN and not is_admin:
-                continue
-            if access == ACCESS_CAPTAIN and not (is_admin or is_captain):
-                continue
-
-            # --- Mark with icons ---
-            if access == ACCESS_ADMIN:
-                icon = "🔒 "
-            elif access == ACCESS_CAPTAIN:
-                icon = "⚓ "
-            else:
-                icon = ""
+            access = COMMAND_ACCESS.get(command.name, ACCESS_EVERYONE)
 
-            display_name = f"{icon}/{cmd_name}"
+            display_name = f"{ACCESS_ICONS[access]}/{command.name}"
             desc = command.description or "No description provided."
-            visible_commands.append((display_name, desc))
+            index.append((int(access), display_name, desc))
 
         # --- Sort alphabetically for neatness ---
-        visible_commands.sort(key=lambda x: x[0].lower())
+        index.sort(key=lambda x: x[1].lower())
+        self._command_index = index
+        self._embeds = {
+            bucket: self._build_embed(user_mask, footer)
+            for bucket, (user_mask, footer) in HELP_BUCKETS.items()
+        }
+
+    def _build_embed(self, user_mask: int, footer: str) -> discord.Embed:
+        embed = discord.Embed(
+            title="📘 QRLS Bot Command Reference",
+            color=discord.Color.blurple()
+        )
 
-        # --- Add commands to embed ---
+        visible_commands = [(name, desc) for mask, name, desc in self._command_index if mask & user_mask]
+
+        # --- Add commands to embed (one description; fields only if it won't fit) ---
         if visible_commands:
-            for name, desc in visible_commands:
-                embed.add_field(name=name, value=desc, inline=False)
+            description = "\n".join(f"**{name}** — {desc}" for name, desc in visible_commands)
+            if len(description) <= EMBED_DESCRIPTION_LIMIT:
+                embed.description = description
+            else:
+                for name, desc in visible_commands:
+                    embed.add_field(name=name, value=desc, inline=False)
         else:
             embed.description = "No commands available to you."
 
@@ -125,14 +139,39 @@ class Help(commands.Cog):
         embed.add_field(name="Legend", value=legend, inline=False)
 
         # --- Footer text ---
-        if is_admin:
-            embed.set_footer(text="You have access to all commands (including Admin-only and Captain-only).")
-        elif is_captain:
-            embed.set_footer(text="⚓ Captain access: Admin-only commands are hidden.")
+        embed.set_footer(text=footer)
+        return embed
+
+    @app_commands.command(
+        name="help",
+        description="Shows the commands available to you and what they do."
+    )
+    async def help(self, interaction: discord.Interaction):
+        """Lists only the commands the user has permission to use."""
+        if not await check_cooldown(interaction):
+            return
+
+        guild = interaction.guild
+        user = interaction.user
+
+        # If it's somehow not in a guild, just bail nicely
+        if not guild or not isinstance(user, discord.Member):
+            await interaction.response.send_message(
+                "❌ This command can only be used in a server.",
+                ephemeral=True
+            )
+            return
+
+        # --- Determine user's permissions ---
+        role_ids = member_role_ids(user)
+        if user.guild_permissions.administrator or (ADMINS_ROLE_ID and ADMINS_ROLE_ID in role_ids):
+            bucket = "admin"
+        elif CAPTAINS_ROLE_ID and CAPTAINS_ROLE_ID in role_ids:
+            bucket = "captain"
         else:
-            embed.set_footer(text="Only showing commands available to you.")
+            bucket = "everyone"
 
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=self._embeds[bucket], ephemeral=True)
 
 
 async def setup(bot: commands.Bot):
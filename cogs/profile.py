@@ -1,28 +1,82 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
+import asyncio
 import csv
 import os
 from typing import Optional
-from dotenv import load_dotenv
 
-from utils.team_info import TEAM_INFO  # ✅ centralized team data
+from utils.team_info import TEAM_INFO_RESOLVED, UNASSIGNED_TEAM_INFO  # ✅ centralized team data
 from utils.global_cooldown import check_cooldown
+from utils.permissions import member_role_ids
 
-# ✅ Load environment variables
-load_dotenv()
+# ✅ Environment variables (.env is loaded by bot.py)
 ADMINS_ROLE_ID = int(os.getenv("ADMINS_ROLE_ID", 0))
 CAPTAINS_ROLE_ID = int(os.getenv("CAPTAINS_ROLE_ID", 0))
 
 CSV_FILE = "data/salaries.csv"
 
-DEFAULT_COLOR = 0x7289DA  # Discord blurple
-DEFAULT_LOGO = "https://example.com/logos/default_team.png"  # fallback
-
 
 class Profile(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # discord_id -> raw csv row; columns are looked up by index
+        self._salary_by_id: dict[str, list[str]] = {}
+        self._salary_mtime = 0.0
+        self._col_nickname: Optional[int] = None
+        self._col_salary: Optional[int] = None
+        self._col_team: Optional[int] = None
+
+    async def cog_load(self):
+        await asyncio.to_thread(self._load_salaries)
+
+    async def _ensure_salaries(self) -> bool:
+        """
+        Cheap mtime check on the event loop; the CSV is only re-parsed (in a worker thread)
+        when it changed. Returns False if the file is missing.
+        """
+        try:
+            mtime = os.stat(CSV_FILE).st_mtime
+        except FileNotFoundError:
+            self._salary_by_id = {}
+            self._salary_mtime = 0.0
+            return False
+        if mtime == self._salary_mtime:
+            return True
+        return await asyncio.to_thread(self._load_salaries)
+
+    def _load_salaries(self) -> bool:
+        """
+        Reloads CSV_FILE into memory (keyed by discord_id) only when its mtime changes.
+        Returns False if the file is missing. Blocking; called via asyncio.to_thread.
+        """
+        try:
+            mtime = os.stat(CSV_FILE).st_mtime
+        except FileNotFoundError:
+            self._salary_by_id = {}
+            self._salary_mtime = 0.0
+            return False
+
+        if mtime != self._salary_mtime:
+            salary_by_id: dict[str, list[str]] = {}
+            with open(CSV_FILE, "r", encoding="utf-8-sig", newline="") as f:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                col = {name: i for i, name in enumerate(header)}
+                idx_id = col["discord_id"]
+                for row in reader:
+                    if len(row) > idx_id:
+                        salary_by_id.setdefault(row[idx_id], row)
+            self._salary_by_id = salary_by_id
+            self._col_nickname = col.get("nickname")
+            self._col_salary = col.get("salary")
+            self._col_team = col.get("team")
+            self._salary_mtime = mtime
+        return True
+
+    @staticmethod
+    def _cell(row: list[str], idx: Optional[int], default: str) -> str:
+        return row[idx] if idx is not None and idx < len(row) else default
 
     @app_commands.command(
         name="profile",
@@ -40,7 +94,7 @@ class Profile(commands.Cog):
             # --- Only Admins (by role ID or permissions) can view other players’ profiles ---
             if not (
                 interaction.user.guild_permissions.administrator
-                or (ADMINS_ROLE_ID and discord.utils.get(interaction.user.roles, id=ADMINS_ROLE_ID))
+                or (ADMINS_ROLE_ID and ADMINS_ROLE_ID in member_role_ids(interaction.user))
             ):
                 await interaction.response.send_message(
                     "🚫 You don’t have permission to view other players’ profiles.",
@@ -48,31 +102,25 @@ class Profile(commands.Cog):
                 )
                 return
 
-        # --- Load salary file ---
-        if not os.path.exists(CSV_FILE):
+        # --- Load salary file (cached; re-read only if it changed) ---
+        if not await self._ensure_salaries():
             await interaction.response.send_message("❌ Salary data file not found.", ephemeral=True)
             return
 
-        player_data = None
-        with open(CSV_FILE, "r", encoding="utf-8-sig", newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row["discord_id"] == str(member.id):
-                    player_data = row
-                    break
+        player_data = self._salary_by_id.get(str(member.id))
 
         if not player_data:
             await interaction.response.send_message(f"❌ No data found for {member.mention}.", ephemeral=True)
             return
 
-        nickname = player_data.get("nickname", member.display_name)
-        salary = player_data.get("salary", "0")
-        team = player_data.get("team", "Unassigned")
+        nickname = self._cell(player_data, self._col_nickname, member.display_name)
+        salary = self._cell(player_data, self._col_salary, "0")
+        team = self._cell(player_data, self._col_team, "Unassigned")
 
         # --- Pull color & logo from TEAM_INFO ---
-        team_info = TEAM_INFO.get(team, {})
-        color = team_info.get("color", DEFAULT_COLOR)
-        logo = team_info.get("logo", DEFAULT_LOGO)
+        team_info = TEAM_INFO_RESOLVED.get(team, UNASSIGNED_TEAM_INFO)
+        color = team_info["color"]
+        logo = team_info["logo"]
 
         # --- Build the embed ---
         embed = discord.Embed(
@@ -1,15 +1,17 @@
-import json
 import os
-import re
-from datetime import datetime, timedelta
+from datetime import datetime
+from functools import lru_cache
+from time import time as unix_now
 from typing import Optional
 
 import discord
 from discord import app_commands, Interaction
 from discord.ext import commands
-from dotenv import load_dotenv
 from zoneinfo import ZoneInfo
 
+from utils.permissions import member_role_ids
+from utils.proposals import proposals
+
 # Optional: reuse cooldowns if desired
 try:
     from utils.global_cooldown import check_cooldown
@@ -17,56 +19,92 @@ except Exception:
     async def check_cooldown(interaction: Interaction) -> bool:
         return True
 
-# ✅ Load environment variables
-load_dotenv()
+# ✅ Environment variables (.env is loaded by bot.py)
 ADMINS_ROLE_ID = int(os.getenv("ADMINS_ROLE_ID", 0))
 CAPTAINS_ROLE_ID = int(os.getenv("CAPTAINS_ROLE_ID", 0))
 SCHED_CATEGORY_ID = int(os.getenv("SCHED_CATEGORY_ID", 0))  # 👈 category ID from .env
 
-DATA_DIR = "data"
-PROPOSALS_FILE = os.path.join(DATA_DIR, "proposals.json")
-
 # Fallback name (only used if SCHED_CATEGORY_ID not provided)
 SCHED_CATEGORY_NAME = "Scheduling Channel"
 
-ET_TZ = ZoneInfo("America/New_York")
-TWO_WEEKS = timedelta(days=14)
+_ALLOWED_MENTIONS = discord.AllowedMentions(roles=True, users=True, everyone=False)
+_EMBED_COLOR = discord.Color.gold()
 
-DATE_RE = re.compile(r"^\s*(\d{1,2})/(\d{1,2})\s*$")  # M/D or MM/DD
-TIME_RE = re.compile(r"^\s*(1[0-2]|0?[1-9])(?:\:([0-5]\d))?\s*([ap]m)\s*$", re.IGNORECASE)
 
+@lru_cache(maxsize=1)
+def _et_tz() -> ZoneInfo:
+    """Single America/New_York tzinfo for the process."""
+    return ZoneInfo("America/New_York")
 
-def ensure_data_file():
-    os.makedirs(DATA_DIR, exist_ok=True)
-    if not os.path.exists(PROPOSALS_FILE):
-        with open(PROPOSALS_FILE, "w", encoding="utf-8") as f:
-            json.dump({}, f)
 
+# Load tzdata and resolve the current offset at import, not on the first /propose
+datetime.now(_et_tz()).utcoffset()
 
-def load_proposals() -> dict:
-    ensure_data_file()
-    with open(PROPOSALS_FILE, "r", encoding="utf-8") as f:
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            return {}
 
+TWO_WEEKS_SECONDS = 14 * 24 * 60 * 60
 
-def save_proposals(data: dict):
-    ensure_data_file()
-    with open(PROPOSALS_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
 
 
 def user_is_admin_or_captain(member: discord.Member) -> bool:
     """Checks if the member is an Admin or Captain using .env role IDs."""
     if member.guild_permissions.administrator:
         return True
-    if ADMINS_ROLE_ID and discord.utils.get(member.roles, id=ADMINS_ROLE_ID):
+    role_ids = member_role_ids(member)
+    return bool(
+        (ADMINS_ROLE_ID and ADMINS_ROLE_ID in role_ids)
+        or (CAPTAINS_ROLE_ID and CAPTAINS_ROLE_ID in role_ids)
+    )
+
+
+class ProposeCheckFailure(app_commands.CheckFailure):
+    """Check failure whose message is shown to the user as-is."""
+
+
+def in_scheduling_category():
+    """Only allow the command inside the configured Scheduling category."""
+    def predicate(interaction: Interaction) -> bool:
+        channel = interaction.channel
+        # Must be in a text channel
+        if not channel or not isinstance(channel, discord.TextChannel):
+            raise ProposeCheckFailure("❌ This command must be used in a text channel.")
+
+        category = channel.category
+        if SCHED_CATEGORY_ID:
+            if not category or category.id != SCHED_CATEGORY_ID:
+                cog = interaction.client.get_cog("Propose")
+                target_cat = cog._get_sched_category(interaction.guild) if cog else None
+                target_name = target_cat.name if target_cat else "the configured Scheduling category"
+                raise ProposeCheckFailure(f"❌ This command can only be used in **{target_name}**.")
+        elif not category or category.name != SCHED_CATEGORY_NAME:
+            raise ProposeCheckFailure(f"❌ This command can only be used in the **{SCHED_CATEGORY_NAME}** category.")
         return True
-    if CAPTAINS_ROLE_ID and discord.utils.get(member.roles, id=CAPTAINS_ROLE_ID):
+    return app_commands.check(predicate)
+
+
+def is_admin_or_captain():
+    """Only allow Admins or Captains (by permission or .env role IDs)."""
+    def predicate(interaction: Interaction) -> bool:
+        member = interaction.user if isinstance(interaction.user, discord.Member) else None
+        if not member:
+            raise ProposeCheckFailure("❌ Could not determine your member information.")
+        if not user_is_admin_or_captain(member):
+            raise ProposeCheckFailure("🚫 Only Admins or Captains can use this command.")
         return True
-    return False
+    return app_commands.check(predicate)
+
+
+def cooldown_check():
+    """Global per-user cooldown; check_cooldown replies to the user when throttled."""
+    async def predicate(interaction: Interaction) -> bool:
+        return await check_cooldown(interaction)
+    return app_commands.check(predicate)
+
+
+def _parse_small_int(s: str, max_len: int) -> Optional[int]:
+    """Parses 1..max_len ASCII digits, else None."""
+    if not (0 < len(s) <= max_len) or not s.isascii() or not s.isdigit():
+        return None
+    return int(s)
 
 
 def parse_et_datetime(date_str: str, time_str: str) -> tuple[Optional[datetime], Optional[str]]:
@@ -76,44 +114,51 @@ def parse_et_datetime(date_str: str, time_str: str) -> tuple[Optional[datetime],
       time_str: H(am/pm) or H:MM(am/pm)
     Returns (dt_et, error_message).
     """
-    dm = DATE_RE.match(date_str or "")
-    if not dm:
+    # Date: M/D or MM/DD
+    month_str, sep, day_str = (date_str or "").strip().partition("/")
+    month = _parse_small_int(month_str, 2)
+    day = _parse_small_int(day_str, 2)
+    if not sep or month is None or day is None:
         return None, "❌ Invalid date format. Use **M/D** (examples: `1/12`, `12/3`)."
-
-    month = int(dm.group(1))
-    day = int(dm.group(2))
     if not (1 <= month <= 12):
         return None, "❌ Month must be between 1 and 12."
     if not (1 <= day <= 31):
         return None, "❌ Day must be between 1 and 31."
 
-    tm = TIME_RE.match(time_str or "")
-    if not tm:
+    # Time: H[:MM] followed by am/pm (optional space before the suffix)
+    t = (time_str or "").strip().lower()
+    ampm = t[-2:]
+    hour_str, sep, minute_str = t[:-2].rstrip().partition(":")
+    hour12 = _parse_small_int(hour_str, 2)
+    minute = _parse_small_int(minute_str, 2) if sep else 0
+    if (
+        ampm not in ("am", "pm")
+        or hour12 is None or not (1 <= hour12 <= 12)
+        or minute is None or (sep and len(minute_str) != 2) or minute > 59
+    ):
         return None, "❌ Invalid time format. Use **H[:MM]am/pm** in **EST/ET** (examples: `8pm`, `8:00pm`, `11:15am`)."
 
-    hour12 = int(tm.group(1))
-    minute = int(tm.group(2) or "0")
-    ampm = tm.group(3).lower()
-
     hour24 = hour12 % 12
     if ampm == "pm":
         hour24 += 12
 
-    now_et = datetime.now(ET_TZ)
-    year = now_et.year
+    et_tz = _et_tz()
+    now_ts = unix_now()
+    year = datetime.fromtimestamp(now_ts, et_tz).year
 
     # Build ET datetime (no year provided; assume current year)
     try:
-        dt_et = datetime(year, month, day, hour24, minute, tzinfo=ET_TZ)
+        dt_et = datetime(year, month, day, hour24, minute, tzinfo=et_tz)
     except ValueError:
         return None, "❌ That date/time isn’t a valid calendar date."
 
-    # Reject past
-    if dt_et <= now_et:
+    # Reject past (compared as epoch seconds)
+    dt_ts = dt_et.timestamp()
+    if dt_ts <= now_ts:
         return None, "❌ That proposed time is in the past (EST/ET). Please choose a future time."
 
     # Only within 14 days
-    if dt_et > (now_et + TWO_WEEKS):
+    if dt_ts > now_ts + TWO_WEEKS_SECONDS:
         return None, "❌ That proposed time is more than **2 weeks** from now. Please choose a time within the next **14 days**."
 
     return dt_et, None
@@ -136,9 +181,10 @@ def format_dt_et(dt_et: datetime) -> str:
 class ProposeConfirmView(discord.ui.View):
     """Confirmation buttons for a proposed time/date."""
 
-    def __init__(self, dt_iso: str, display_text: str, author: discord.Member):
+    def __init__(self, cog: "Propose", dt_et: datetime, display_text: str, author: discord.Member):
         super().__init__(timeout=60 * 60 * 24) # 24hrs
-        self.dt_iso = dt_iso
+        self.cog = cog
+        self.dt_et = dt_et
         self.display_text = display_text
         self.author = author
         self.result: Optional[bool] = None
@@ -156,25 +202,19 @@ class ProposeConfirmView(discord.ui.View):
     async def confirm(self, interaction: Interaction, button: discord.ui.Button):
         await interaction.response.defer(ephemeral=True)
 
-        proposals = load_proposals()
-        proposals[str(interaction.channel.id)] = {
-            "dt_iso": self.dt_iso,               # canonical
+        proposals.set(interaction.channel.id, {
+            "dt_iso": self.dt_et.isoformat(),    # canonical
             "display": self.display_text,        # nice text
             "proposer_id": interaction.user.id
-        }
-        save_proposals(proposals)
+        })
 
         # ✅ Ping captains OUTSIDE the embed so the role actually pings
-        allowed_mentions = discord.AllowedMentions(roles=True, users=True, everyone=False)
-
-        captains_role = None
-        if interaction.guild and CAPTAINS_ROLE_ID:
-            captains_role = interaction.guild.get_role(CAPTAINS_ROLE_ID)
+        captains_role = self.cog._get_captains_role(interaction.guild)
 
         if captains_role:
             await interaction.followup.send(
                 content=f"{captains_role.mention} — A match time has been proposed.",
-                allowed_mentions=allowed_mentions
+                allowed_mentions=_ALLOWED_MENTIONS
             )
         else:
             await interaction.followup.send(content="@Captains — A match time has been proposed.")
@@ -182,9 +222,9 @@ class ProposeConfirmView(discord.ui.View):
         embed = discord.Embed(
             title="📌 Proposed Match Time",
             description=f"**{interaction.user.mention}** proposed:\n**{self.display_text}**",
-            color=discord.Color.gold()
+            color=_EMBED_COLOR
         )
-        await interaction.followup.send(embed=embed, allowed_mentions=allowed_mentions)
+        await interaction.followup.send(embed=embed, allowed_mentions=_ALLOWED_MENTIONS)
 
         self.result = True
         self.stop()
@@ -200,31 +240,53 @@ class ProposeConfirmView(discord.ui.View):
 class Propose(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-
-    async def _check_permissions_and_location(self, interaction: Interaction) -> Optional[str]:
-        # Must be in a text channel
-        if not interaction.channel or not isinstance(interaction.channel, discord.TextChannel):
-            return "❌ This command must be used in a text channel."
-
-        # Must be in the configured Scheduling category
-        category = interaction.channel.category
-        if SCHED_CATEGORY_ID:
-            if not category or category.id != SCHED_CATEGORY_ID:
-                target_cat = interaction.guild.get_channel(SCHED_CATEGORY_ID)
-                target_name = target_cat.name if target_cat else "the configured Scheduling category"
-                return f"❌ This command can only be used in **{target_name}**."
-        else:
-            if not category or category.name != SCHED_CATEGORY_NAME:
-                return f"❌ This command can only be used in the **{SCHED_CATEGORY_NAME}** category."
-
-        # Check roles
-        member = interaction.user if isinstance(interaction.user, discord.Member) else None
-        if not member:
-            return "❌ Could not determine your member information."
-        if not user_is_admin_or_captain(member):
-            return "🚫 Only Admins or Captains can use this command."
-
-        return None
+        # Resolved lazily per guild; dropped when the role/category changes
+        self._captains_role_by_guild: dict[int, discord.Role] = {}
+        self._sched_category_by_guild: dict[int, discord.abc.GuildChannel] = {}
+
+    async def cog_load(self):
+        await proposals.start()
+
+    async def cog_unload(self):
+        await proposals.stop()
+
+    def _get_captains_role(self, guild: Optional[discord.Guild]) -> Optional[discord.Role]:
+        if not guild or not CAPTAINS_ROLE_ID:
+            return None
+        role = self._captains_role_by_guild.get(guild.id)
+        if role is None:
+            role = guild.get_role(CAPTAINS_ROLE_ID)
+            if role is not None:
+                self._captains_role_by_guild[guild.id] = role
+        return role
+
+    def _get_sched_category(self, guild: discord.Guild) -> Optional[discord.abc.GuildChannel]:
+        category = self._sched_category_by_guild.get(guild.id)
+        if category is None:
+            category = guild.get_channel(SCHED_CATEGORY_ID)
+            if category is not None:
+                self._sched_category_by_guild[guild.id] = category
+        return category
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        if after.id == CAPTAINS_ROLE_ID:
+            self._captains_role_by_guild.pop(after.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        if role.id == CAPTAINS_ROLE_ID:
+            self._captains_role_by_guild.pop(role.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        if after.id == SCHED_CATEGORY_ID:
+            self._sched_category_by_guild.pop(after.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        if channel.id == SCHED_CATEGORY_ID:
+            self._sched_category_by_guild.pop(channel.guild.id, None)
 
     @app_commands.command(
         name="propose",
@@ -234,22 +296,18 @@ class Propose(commands.Cog):
         date="Date in M/D format (example: 1/12 or 12/3)",
         time="Time in EST/ET (example: 8pm or 8:00pm)"
     )
+    # Checks run bottom-up: location, then role, then cooldown
+    @cooldown_check()
+    @is_admin_or_captain()
+    @in_scheduling_category()
     async def propose(self, interaction: Interaction, date: str, time: str):
-        if not await check_cooldown(interaction):
-            return
-
-        error = await self._check_permissions_and_location(interaction)
-        if error:
-            await interaction.response.send_message(error, ephemeral=True)
-            return
-
         dt_et, parse_err = parse_et_datetime(date, time)
         if parse_err:
             await interaction.response.send_message(parse_err, ephemeral=True)
             return
 
         display = format_dt_et(dt_et)
-        view = ProposeConfirmView(dt_iso=dt_et.isoformat(), display_text=display, author=interaction.user)
+        view = ProposeConfirmView(cog=self, dt_et=dt_et, display_text=display, author=interaction.user)
 
         await interaction.response.send_message(
             f"📝 You entered: **{display}**\nPlease confirm your proposal:",
@@ -259,6 +317,11 @@ class Propose(commands.Cog):
 
     @propose.error
     async def propose_error(self, interaction: Interaction, error):
+        if isinstance(error, app_commands.CheckFailure):
+            # The cooldown check answers the interaction itself
+            if isinstance(error, ProposeCheckFailure) and not interaction.response.is_done():
+                await interaction.response.send_message(str(error), ephemeral=True)
+            return
         raise error
 
 
@@ -1,10 +1,15 @@
 # cogs/refresh.py
 import os
 import csv
+import asyncio
+from operator import itemgetter
+from typing import Optional
+
 import discord
 from discord import app_commands, Interaction
 from discord.ext import commands
 from dotenv import load_dotenv
+from utils.permissions import member_role_ids
 
 import gspread
 from google.oauth2.service_account import Credentials
@@ -28,6 +33,8 @@ CHANGELOG_CHANNEL_ID = int(os.getenv("CHANGELOG_CHANNEL_ID", 0))
 
 CSV_FILE = "data/salaries.csv"
 REQUIRED_HEADERS = ["discord_id", "nickname", "salary", "team", "captain"]
+# Normalized row dict -> tuple in REQUIRED_HEADERS order (for csv.writer)
+_row_values = itemgetter(*REQUIRED_HEADERS)
 
 SCOPES = [
     "https://www.googleapis.com/auth/spreadsheets.readonly",
@@ -39,7 +46,7 @@ def is_admin_user(member: discord.Member) -> bool:
     """Admins by permission or by ADMINS_ROLE_ID in .env"""
     if member.guild_permissions.administrator:
         return True
-    if ADMINS_ROLE_ID and discord.utils.get(member.roles, id=ADMINS_ROLE_ID):
+    if ADMINS_ROLE_ID and ADMINS_ROLE_ID in member_role_ids(member):
         return True
     return False
 
@@ -53,25 +60,68 @@ def get_gspread_client():
     return gspread.authorize(creds)
 
 
+# Authorized client and opened worksheets, reused across /refresh calls.
+# google-auth refreshes the access token on the client's session as needed.
+_gc_client: Optional[gspread.Client] = None
+_worksheet_cache: dict[tuple[str, str], gspread.Worksheet] = {}
+
+
+def get_worksheet(sheet_id: str, worksheet_name: str) -> gspread.Worksheet:
+    """Blocking: returns the cached worksheet, opening it (and the client) on first use."""
+    global _gc_client
+    key = (sheet_id, worksheet_name)
+    ws = _worksheet_cache.get(key)
+    if ws is None:
+        if _gc_client is None:
+            _gc_client = get_gspread_client()
+        sh = _gc_client.open_by_key(sheet_id)
+        ws = sh.worksheet(worksheet_name) if worksheet_name else sh.sheet1
+        _worksheet_cache[key] = ws
+    return ws
+
+
+def fetch_sheet_records() -> list[dict]:
+    """Blocking: pull every row from the configured worksheet. Run via asyncio.to_thread."""
+    ws = get_worksheet(SHEET_ID, WORKSHEET_NAME)
+    try:
+        return ws.get_all_records(default_blank="")
+    except gspread.exceptions.APIError:
+        # Worksheet may have been renamed/deleted; reopen it on the next call
+        _worksheet_cache.pop((SHEET_ID, WORKSHEET_NAME), None)
+        raise
+
+
+def write_salaries_csv(records: list[dict]):
+    """Blocking: overwrite CSV_FILE, normalizing sheet records as they are written. Run via asyncio.to_thread."""
+    os.makedirs(os.path.dirname(CSV_FILE), exist_ok=True)
+    with open(CSV_FILE, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(REQUIRED_HEADERS)
+        writer.writerows(_row_values(normalize_row(r)) for r in records)
+
+
 def normalize_row(row: dict) -> dict:
     """Normalize types and whitespace; safely handle numeric salary values."""
     out = {}
     for k in REQUIRED_HEADERS:
         val = row.get(k, "")
-        # Convert numbers to strings and strip safely
-        if isinstance(val, (int, float)):
-            val = str(val)
+        # Sheet cells are almost always plain str; numbers come through as int/float
+        if type(val) is str:
+            out[k] = val.strip()
         elif val is None:
-            val = ""
+            out[k] = ""
         else:
-            val = str(val).strip()
-        out[k] = val
+            out[k] = str(val)
 
-    # Convert salary field to integer string
-    try:
-        out["salary"] = str(int(float(out["salary"])))
-    except Exception:
-        out["salary"] = out["salary"] or "0"
+    # Convert salary field to integer string (blank -> "0", non-numeric kept as-is)
+    salary = out["salary"]
+    if not salary:
+        out["salary"] = "0"
+    else:
+        try:
+            out["salary"] = str(int(float(salary)))
+        except (ValueError, OverflowError):
+            pass
 
     # captain stays as-is (e.g., "TRUE"/"FALSE" from sheet)
     return out
@@ -80,19 +130,29 @@ def normalize_row(row: dict) -> dict:
 class Refresh(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # Resolved on first use; dropped if the channel is deleted
+        self._changelog_channel: Optional[discord.abc.Messageable] = None
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        if channel.id == CHANGELOG_CHANNEL_ID:
+            self._changelog_channel = None
 
     async def _log_to_changelog(self, interaction: Interaction, msg: str):
         """Send a log message to the configured changelog channel, if set."""
         if not CHANGELOG_CHANNEL_ID:
             return  # no channel configured
 
-        # Try to get the channel from the bot cache
-        channel = self.bot.get_channel(CHANGELOG_CHANNEL_ID)
-        if channel is None and interaction.guild is not None:
-            channel = interaction.guild.get_channel(CHANGELOG_CHANNEL_ID)
-
+        channel = self._changelog_channel
         if channel is None:
-            return
+            # Try to get the channel from the bot cache
+            channel = self.bot.get_channel(CHANGELOG_CHANNEL_ID)
+            if channel is None and interaction.guild is not None:
+                channel = interaction.guild.get_channel(CHANGELOG_CHANNEL_ID)
+
+            if channel is None:
+                return
+            self._changelog_channel = channel
 
         # Post the same message plus who ran it
         await channel.send(f"🧾 `/refresh` by {interaction.user.mention}:\n{msg}")
@@ -122,12 +182,8 @@ class Refresh(commands.Cog):
             return
 
         try:
-            gc = get_gspread_client()
-            sh = gc.open_by_key(SHEET_ID)
-            ws = sh.worksheet(WORKSHEET_NAME) if WORKSHEET_NAME else sh.sheet1
-
-            # Pull rows
-            values = ws.get_all_records(default_blank="")
+            # Pull rows (off the event loop)
+            values = await asyncio.to_thread(fetch_sheet_records)
             if not values:
                 await interaction.followup.send("⚠️ Sheet appears empty (no data rows).", ephemeral=True)
                 return
@@ -144,14 +200,11 @@ class Refresh(commands.Cog):
                 await interaction.followup.send(msg, ephemeral=True)
                 return
 
-            # Normalize
-            normalized = [normalize_row(r) for r in values]
-
             # Dry run
             if dry_run:
                 msg = (
                     "🔎 **Dry run** complete.\n"
-                    f"• Rows found: **{len(normalized)}**\n"
+                    f"• Rows found: **{len(values)}**\n"
                     f"• Required headers OK ✅\n"
                     + (f"• Extra columns (ignored): {', '.join(extra)}" if extra else "• No extra columns.")
                 )
@@ -159,14 +212,10 @@ class Refresh(commands.Cog):
                 await self._log_to_changelog(interaction, msg)
                 return
 
-            # Write CSV
-            os.makedirs(os.path.dirname(CSV_FILE), exist_ok=True)
-            with open(CSV_FILE, "w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=REQUIRED_HEADERS)
-                writer.writeheader()
-                writer.writerows(normalized)
+            # Write CSV (rows are normalized as they stream to the writer)
+            await asyncio.to_thread(write_salaries_csv, values)
 
-            msg = f"✅ Refreshed **{CSV_FILE}** with **{len(normalized)}** rows."
+            msg = f"✅ Refreshed **{CSV_FILE}** with **{len(values)}** rows."
             await interaction.followup.send(msg, ephemeral=True)
             await self._log_to_changelog(interaction, msg)
 
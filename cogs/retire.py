@@ -1,7 +1,6 @@
 import os
 import json
-import logging
-import traceback
+import asyncio
 from typing import Optional
 
 import discord
@@ -12,25 +11,22 @@ from dotenv import load_dotenv
 import gspread
 from google.oauth2.service_account import Credentials
 
-from utils.team_info import TEAM_INFO
+from utils.permissions import member_role_ids
+from utils.team_info import TEAM_ROLE_IDS
+from utils.logging import get_logger
 
 load_dotenv()
 
-logger = logging.getLogger("qrls.retire")
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] %(name)s: %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-logger.setLevel(logging.INFO)
+logger = get_logger("qrls.retire")
+
+_USER_MENTIONS = discord.AllowedMentions(users=True, roles=False, everyone=False)
 
 
 def log_exception(step: str, error: Exception):
     """
     Centralized exception logger for /retire.
     """
-    logger.error("❌ /retire crashed at step=%s | %s: %r", step, type(error).__name__, error)
-    traceback.print_exc()
+    logger.exception("❌ /retire crashed at step=%s", step, exc_info=error)
 
 
 def _get_env_int(name: str) -> Optional[int]:
@@ -43,10 +39,6 @@ def _get_env_int(name: str) -> Optional[int]:
         return None
 
 
-def _normalize(s: str) -> str:
-    return (s or "").strip()
-
-
 def _get_gspread_client(sa_json: str) -> gspread.Client:
     """
     Supports GOOGLE_SERVICE_ACCOUNT_JSON as:
@@ -73,18 +65,6 @@ def _get_gspread_client(sa_json: str) -> gspread.Client:
     return gspread.service_account(filename=sa_val)
 
 
-def _get_team_role_id(team_name: str) -> Optional[int]:
-    info = TEAM_INFO.get(team_name)
-    if not isinstance(info, dict):
-        return None
-    role_id = info.get("id")
-    if isinstance(role_id, int):
-        return role_id
-    if isinstance(role_id, str) and role_id.isdigit():
-        return int(role_id)
-    return None
-
-
 class Retire(commands.Cog):
     """
     /retire – Admin-only command to retire a player:
@@ -106,23 +86,35 @@ class Retire(commands.Cog):
         self.sheet_id = os.getenv("GOOGLE_SHEET_ID", "")
         self.worksheet_name = os.getenv("GOOGLE_WORKSHEET", "")
 
+        # Role IDs /retire strips: every TEAM_INFO role plus Captains/Waivers (fixed at load)
+        team_role_ids = set(TEAM_ROLE_IDS.values())
+        special_ids = {rid for rid in (self.captains_role_id, self.waivers_role_id) if rid}
+        self._retire_role_ids: frozenset[int] = frozenset(team_role_ids | special_ids)
+
+        # Resolved on first use; dropped if the channel is deleted
+        self._transactions_channel: Optional[discord.TextChannel] = None
+
+        # Authorized client / worksheet, opened on first use and reused
+        self._gc: Optional[gspread.Client] = None
+        self._ws: Optional[gspread.Worksheet] = None
+
         # Sheet columns: A=Discord ID, D=Team, E=Captain
         self.COL_DISCORD_ID = 0
         self.COL_TEAM = 3
         self.COL_CAPTAIN = 4
 
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        if channel.id == self.transactions_channel_id:
+            self._transactions_channel = None
+
     # ---------------------------
     # Helpers
     # ---------------------------
-    def _has_role_id(self, member: discord.Member, role_id: int) -> bool:
-        return any(r.id == role_id for r in member.roles)
-
     def _is_admin_member(self, member: discord.Member) -> bool:
         if getattr(member.guild_permissions, "administrator", False):
             return True
-        if self.admins_role_id and self._has_role_id(member, self.admins_role_id):
-            return True
-        return False
+        return bool(self.admins_role_id and self.admins_role_id in member_role_ids(member))
 
     def _open_worksheet(self):
         if not self.sheet_id:
@@ -130,19 +122,21 @@ class Retire(commands.Cog):
         if not self.worksheet_name:
             raise RuntimeError("GOOGLE_WORKSHEET is missing from .env")
 
-        gc = _get_gspread_client(self.sa_json)
-        sh = gc.open_by_key(self.sheet_id)
-        return sh.worksheet(self.worksheet_name)
+        if self._ws is not None:
+            return self._ws
 
-    def _find_row_index_by_discord_id(self, values: list[list[str]], discord_id: int) -> Optional[int]:
-        """
-        Returns 1-based row index for gspread (since update_cell uses 1-based indexes).
-        """
-        target = str(discord_id)
-        for i, row in enumerate(values, start=1):
-            if len(row) > self.COL_DISCORD_ID and _normalize(row[self.COL_DISCORD_ID]) == target:
-                return i
-        return None
+        if self._gc is None:
+            self._gc = _get_gspread_client(self.sa_json)
+        sh = self._gc.open_by_key(self.sheet_id)
+        self._ws = sh.worksheet(self.worksheet_name)
+        return self._ws
+
+    def _retire_row(self, ws, row_index: int):
+        """Blocking: marks the row as Retired / not captain in one request. Run via asyncio.to_thread."""
+        ws.batch_update([
+            {"range": gspread.utils.rowcol_to_a1(row_index, self.COL_TEAM + 1), "values": [["Retired"]]},
+            {"range": gspread.utils.rowcol_to_a1(row_index, self.COL_CAPTAIN + 1), "values": [["FALSE"]]},
+        ])
 
     async def _remove_team_and_special_roles(self, member: discord.Member) -> str:
         """
@@ -152,25 +146,7 @@ class Retire(commands.Cog):
           • WAIVERS_ROLE_ID (if present as a separate role)
         Returns a short status message.
         """
-        guild = member.guild
-
-        # Gather all possible team role IDs from TEAM_INFO
-        team_role_ids: set[int] = set()
-        for team_name in TEAM_INFO.keys():
-            rid = _get_team_role_id(team_name)
-            if rid:
-                team_role_ids.add(rid)
-
-        # Add captain role + waivers role if configured
-        special_ids: set[int] = set()
-        if self.captains_role_id:
-            special_ids.add(self.captains_role_id)
-        if self.waivers_role_id:
-            special_ids.add(self.waivers_role_id)
-
-        ids_to_remove = team_role_ids | special_ids
-
-        roles_to_remove = [r for r in member.roles if r.id in ids_to_remove]
+        roles_to_remove = [r for r in member.roles if r.id in self._retire_role_ids]
 
         if not roles_to_remove:
             return "No team/waiver/captain roles to remove."
@@ -183,9 +159,8 @@ class Retire(commands.Cog):
             return f"Removed {len(roles_to_remove)} role(s) from {member.mention}."
         except discord.Forbidden:
             return "⚠️ Bot lacks permission to remove some roles (check role hierarchy/permissions)."
-        except Exception as e:
-            logger.error("Error removing roles in /retire: %r", e)
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error removing roles in /retire")
             return "⚠️ Unexpected error while removing roles (see console)."
 
     async def _post_transactions_log(
@@ -204,13 +179,16 @@ class Retire(commands.Cog):
                 logger.warning("TRANSACTIONS_CHANNEL_ID missing/invalid; skipping retire log post.")
                 return
 
-            ch = self.bot.get_channel(self.transactions_channel_id)
-            if not isinstance(ch, discord.TextChannel):
-                logger.warning(
-                    "TRANSACTIONS_CHANNEL_ID=%s does not resolve to a text channel; skipping.",
-                    self.transactions_channel_id
-                )
-                return
+            ch = self._transactions_channel
+            if ch is None:
+                ch = self.bot.get_channel(self.transactions_channel_id)
+                if not isinstance(ch, discord.TextChannel):
+                    logger.warning(
+                        "TRANSACTIONS_CHANNEL_ID=%s does not resolve to a text channel; skipping.",
+                        self.transactions_channel_id
+                    )
+                    return
+                self._transactions_channel = ch
 
             if player_member is not None:
                 mention = player_member.mention
@@ -225,11 +203,10 @@ class Retire(commands.Cog):
 
             await ch.send(
                 content=base_message,
-                allowed_mentions=discord.AllowedMentions(users=True, roles=False, everyone=False)
+                allowed_mentions=_USER_MENTIONS
             )
-        except Exception as e:
-            logger.error("Failed posting retire log for player_id=%s", player_id)
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Failed posting retire log for player_id=%s", player_id)
 
     # ---------------------------
     # /retire command
@@ -323,17 +300,25 @@ class Retire(commands.Cog):
 
             # ---- Open worksheet & locate player row ----
             step = "OPEN_SHEET"
-            ws = self._open_worksheet()
+            ws = await asyncio.to_thread(self._open_worksheet)
 
             step = "READ_VALUES"
-            values = ws.get_all_values()
-            if not values:
+            try:
+                # Only Column A (Discord ID) is needed to locate the row
+                discord_ids = await asyncio.to_thread(ws.col_values, self.COL_DISCORD_ID + 1)
+            except gspread.exceptions.APIError:
+                # Worksheet may have been renamed/deleted; reopen it next time
+                self._ws = None
+                raise
+            if not discord_ids:
                 await interaction.followup.send("❌ Worksheet is empty.", ephemeral=True)
                 return
 
             step = "FIND_ROW"
-            row_index = self._find_row_index_by_discord_id(values, player_id_int)
-            if not row_index:
+            try:
+                # 1-based row index for gspread (first occurrence wins)
+                row_index = discord_ids.index(str(player_id_int)) + 1
+            except ValueError:
                 await interaction.followup.send(
                     f"❌ Player with Discord ID `{player_id_int}` is not found in the Google Sheet (Column A, Discord ID).",
                     ephemeral=True
@@ -342,8 +327,8 @@ class Retire(commands.Cog):
 
             # ---- Update sheet (Retired / FALSE) ----
             step = "UPDATE_SHEET"
-            ws.update_cell(row_index, self.COL_TEAM + 1, "Retired")
-            ws.update_cell(row_index, self.COL_CAPTAIN + 1, "FALSE")
+            await asyncio.to_thread(self._retire_row, ws, row_index)
+            self.bot.dispatch("roster_sheet_updated")
 
             # ---- Try to resolve member in guild (if we don't already have it from dropdown) ----
             step = "RESOLVE_MEMBER"
@@ -382,7 +367,7 @@ class Retire(commands.Cog):
                     f"🔧 {role_msg}"
                 ),
                 ephemeral=True,
-                allowed_mentions=discord.AllowedMentions(users=True, roles=False, everyone=False)
+                allowed_mentions=_USER_MENTIONS
             )
 
         except Exception as e:
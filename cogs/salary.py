@@ -1,3 +1,4 @@
+import asyncio
 import csv
 import os
 from typing import Optional
@@ -7,10 +8,13 @@ from discord import app_commands, Interaction
 from discord.ext import commands
 from dotenv import load_dotenv
 
+from utils.env import env_int
+from utils.permissions import member_role_ids
+
 # ✅ Load environment variables
 load_dotenv()
-ADMINS_ROLE_ID = int(os.getenv("ADMINS_ROLE_ID", 0))
-CAPTAINS_ROLE_ID = int(os.getenv("CAPTAINS_ROLE_ID", 0))
+ADMINS_ROLE_ID = env_int("ADMINS_ROLE_ID")
+CAPTAINS_ROLE_ID = env_int("CAPTAINS_ROLE_ID")
 
 # Optional: global cooldown support
 try:
@@ -27,16 +31,75 @@ def user_is_admin_or_captain(member: discord.Member) -> bool:
     """Check if member is an Admin or Captain using .env role IDs."""
     if member.guild_permissions.administrator:
         return True
-    if ADMINS_ROLE_ID and discord.utils.get(member.roles, id=ADMINS_ROLE_ID):
+    role_ids = member_role_ids(member)
+    if ADMINS_ROLE_ID and ADMINS_ROLE_ID in role_ids:
         return True
-    if CAPTAINS_ROLE_ID and discord.utils.get(member.roles, id=CAPTAINS_ROLE_ID):
+    if CAPTAINS_ROLE_ID and CAPTAINS_ROLE_ID in role_ids:
         return True
     return False
 
 
+def _cell(row: list[str], idx: Optional[int], default: str) -> str:
+    return row[idx] if idx is not None and idx < len(row) else default
+
+
 class Salary(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # discord_id -> (nickname, salary, team), reloaded only when the file changes
+        self._salary_by_id: dict[str, tuple[str, str, str]] = {}
+        self._salary_mtime = 0.0
+
+    async def cog_load(self):
+        await asyncio.to_thread(self._load_salaries)
+
+    async def _ensure_salaries(self) -> bool:
+        """
+        Cheap mtime check on the event loop; the CSV is only re-parsed (in a worker thread)
+        when it changed. Returns False if the file is missing.
+        """
+        try:
+            mtime = os.stat(CSV_FILE).st_mtime
+        except FileNotFoundError:
+            self._salary_by_id = {}
+            self._salary_mtime = 0.0
+            return False
+        if mtime == self._salary_mtime:
+            return True
+        return await asyncio.to_thread(self._load_salaries)
+
+    def _load_salaries(self) -> bool:
+        """
+        Reloads CSV_FILE into memory (keyed by discord_id) only when its mtime changes.
+        Returns False if the file is missing. Blocking; called via asyncio.to_thread.
+        """
+        try:
+            mtime = os.stat(CSV_FILE).st_mtime
+        except FileNotFoundError:
+            self._salary_by_id = {}
+            self._salary_mtime = 0.0
+            return False
+
+        if mtime != self._salary_mtime:
+            salary_by_id: dict[str, tuple[str, str, str]] = {}
+            with open(CSV_FILE, "r", encoding="utf-8-sig", newline="") as f:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                col = {name: i for i, name in enumerate(header)}
+                idx_id = col["discord_id"]
+                idx_nickname = col.get("nickname")
+                idx_salary = col.get("salary")
+                idx_team = col.get("team")
+                for row in reader:
+                    if len(row) > idx_id and row[idx_id] not in salary_by_id:
+                        salary_by_id[row[idx_id]] = (
+                            _cell(row, idx_nickname, "Unknown"),
+                            _cell(row, idx_salary, "0"),
+                            _cell(row, idx_team, "Unassigned"),
+                        )
+            self._salary_by_id = salary_by_id
+            self._salary_mtime = mtime
+        return True
 
     @app_commands.command(
         name="salary",
@@ -54,38 +117,31 @@ class Salary(commands.Cog):
         if not await check_cooldown(interaction):
             return
 
-        # Determine target user
-        target_id = None
-        if member:
-            target_id = str(member.id)
-        elif discord_id:
-            target_id = discord_id
-        else:
-            target_id = str(interaction.user.id)
-            member = interaction.user
-
-        # Permission check if viewing others
-        if target_id != str(interaction.user.id):
-            if not user_is_admin_or_captain(interaction.user):
+        if discord_id is not None:
+            discord_id = discord_id.strip()
+            if not (discord_id.isascii() and discord_id.isdigit()):
                 await interaction.response.send_message(
-                    "🚫 You don’t have permission to view other players’ salaries.",
+                    "❌ `discord_id` must be a numeric Discord ID.",
                     ephemeral=True
                 )
                 return
 
-        # Check salary file
-        if not os.path.exists(CSV_FILE):
-            await interaction.response.send_message("❌ Salary data file not found.", ephemeral=True)
+        # Determine target user; viewing someone else requires Admin/Captain (no I/O if denied)
+        self_id = str(interaction.user.id)
+        target_id = str(member.id) if member else (discord_id or self_id)
+        if target_id != self_id and not user_is_admin_or_captain(interaction.user):
+            await interaction.response.send_message(
+                "🚫 You don’t have permission to view other players’ salaries.",
+                ephemeral=True
+            )
             return
 
-        player_data = None
-        with open(CSV_FILE, "r", encoding="utf-8-sig", newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row["discord_id"] == target_id:
-                    player_data = row
-                    break
+        # Cached lookup (re-parses only if the file changed)
+        if not await self._ensure_salaries():
+            await interaction.response.send_message("❌ Salary data file not found.", ephemeral=True)
+            return
 
+        player_data = self._salary_by_id.get(target_id)
         if not player_data:
             await interaction.response.send_message(
                 f"❌ No salary data found for <@{target_id}>.",
@@ -93,9 +149,7 @@ class Salary(commands.Cog):
             )
             return
 
-        nickname = player_data.get("nickname", "Unknown")
-        salary = player_data.get("salary", "0")
-        team = player_data.get("team", "Unassigned")
+        nickname, salary, team = player_data
 
         embed = discord.Embed(
             title="💰 Salary Information",
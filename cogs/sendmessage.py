@@ -1,23 +1,18 @@
-import os
-import logging
-
 import discord
 from discord import app_commands, Interaction
 from discord.ext import commands
 from dotenv import load_dotenv
 
+from utils.env import env_int
+from utils.permissions import member_role_ids
+from utils.logging import get_logger
+
 load_dotenv()
 
-logger = logging.getLogger("qrls.sendmessage")
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] %(name)s: %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-logger.setLevel(logging.INFO)
+logger = get_logger("qrls.sendmessage")
 
-ADMINS_ROLE_ID = int(os.getenv("ADMINS_ROLE_ID", 0))
-CHANGELOG_CHANNEL_ID = int(os.getenv("CHANGELOG_CHANNEL_ID", 0))
+ADMINS_ROLE_ID = env_int("ADMINS_ROLE_ID")
+CHANGELOG_CHANNEL_ID = env_int("CHANGELOG_CHANNEL_ID")
 
 
 def user_is_admin(member: discord.Member) -> bool:
@@ -30,7 +25,7 @@ def user_is_admin(member: discord.Member) -> bool:
     if member.guild_permissions.administrator:
         return True
 
-    if ADMINS_ROLE_ID and any(role.id == ADMINS_ROLE_ID for role in member.roles):
+    if ADMINS_ROLE_ID and ADMINS_ROLE_ID in member_role_ids(member):
         return True
 
     return False
@@ -52,20 +47,13 @@ class SendMessage(commands.Cog):
         channel_id="The ID of the channel to send the message to",
         message="The message to send",
     )
+    @app_commands.guild_only()
     async def sendmessage(
         self,
         interaction: Interaction,
         channel_id: str,
         message: str,
     ):
-        # Must be in a guild
-        if interaction.guild is None or not isinstance(interaction.user, discord.Member):
-            await interaction.response.send_message(
-                "This command can only be used in a server.",
-                ephemeral=True,
-            )
-            return
-
         # Permission check - ONLY admins
         if not user_is_admin(interaction.user):
             await interaction.response.send_message(
@@ -74,15 +62,15 @@ class SendMessage(commands.Cog):
             )
             return
 
-        # Validate channel ID
-        try:
-            channel_id_int = int(channel_id)
-        except ValueError:
+        # Validate channel ID (plain ASCII digits only; no exception on bad input)
+        channel_id = channel_id.strip()
+        if not (channel_id.isascii() and channel_id.isdigit()):
             await interaction.response.send_message(
                 "Invalid channel ID provided.",
                 ephemeral=True,
             )
             return
+        channel_id_int = int(channel_id)
 
         channel = self.bot.get_channel(channel_id_int)
 
@@ -1,7 +1,8 @@
 import os
 import json
-import logging
+import asyncio
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
 import discord
@@ -9,20 +10,18 @@ from discord import app_commands, Interaction
 from discord.ext import commands
 from dotenv import load_dotenv
 
+from utils.env import env_int
+from utils.permissions import member_role_ids
+from utils.logging import get_logger
+
 load_dotenv()
 
-logger = logging.getLogger("qrls.settoken")
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] %(name)s: %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-logger.setLevel(logging.INFO)
+logger = get_logger("qrls.settoken")
 
 DATA_DIR = "data"
 TOKEN_STORE_FILE = os.path.join(DATA_DIR, "token_store.json")
 
-ADMINS_ROLE_ID = int(os.getenv("ADMINS_ROLE_ID", 0))  # your standard admin role
+ADMINS_ROLE_ID = env_int("ADMINS_ROLE_ID")  # your standard admin role
 
 
 def ensure_data_dir() -> None:
@@ -30,9 +29,10 @@ def ensure_data_dir() -> None:
         os.makedirs(DATA_DIR, exist_ok=True)
 
 
+@lru_cache(maxsize=1)
 def get_expiry_minutes() -> int:
     """
-    Read TOKEN_EXPIRY_MINUTES from .env.
+    Read TOKEN_EXPIRY_MINUTES from .env (parsed once per process).
     Defaults to 60 minutes if missing/invalid.
     """
     raw = os.getenv("TOKEN_EXPIRY_MINUTES", "60")
@@ -48,18 +48,25 @@ def get_expiry_minutes() -> int:
         return 60
 
 
-def save_token_store(data: Dict[str, Any]) -> None:
-    """
-    Save token + metadata to JSON file.
-    """
+def _write_token_store(data: Dict[str, Any]) -> None:
     ensure_data_dir()
     try:
-        with open(TOKEN_STORE_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        # Write to a temp file and swap it in so a crash never leaves a truncated store
+        tmp_path = TOKEN_STORE_FILE + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, TOKEN_STORE_FILE)
     except Exception as e:
         logger.error("Failed to write token store: %s", e, exc_info=True)
 
 
+async def save_token_store(data: Dict[str, Any]) -> None:
+    """
+    Save token + metadata to JSON file (file I/O runs in a worker thread).
+    """
+    await asyncio.to_thread(_write_token_store, data)
+
+
 def user_is_admin(member: discord.Member) -> bool:
     """
     Standard QRLS-style admin check:
@@ -70,7 +77,7 @@ def user_is_admin(member: discord.Member) -> bool:
     if member.guild_permissions.administrator:
         return True
 
-    if ADMINS_ROLE_ID and any(role.id == ADMINS_ROLE_ID for role in member.roles):
+    if ADMINS_ROLE_ID and ADMINS_ROLE_ID in member_role_ids(member):
         return True
 
     return False
@@ -91,15 +98,8 @@ class SetToken(commands.Cog):
     @app_commands.describe(
         token="The Discord bot token to store temporarily."
     )
+    @app_commands.guild_only()
     async def settoken(self, interaction: Interaction, token: str):
-        # Must be in a guild and user must be a Member
-        if interaction.guild is None or not isinstance(interaction.user, discord.Member):
-            await interaction.response.send_message(
-                "This command can only be used in a server.",
-                ephemeral=True,
-            )
-            return
-
         # Permission check
         if not user_is_admin(interaction.user):
             await interaction.response.send_message(
@@ -122,7 +122,7 @@ class SetToken(commands.Cog):
             "expires_at": expires_at.isoformat(),
         }
 
-        save_token_store(data)
+        await save_token_store(data)
 
         logger.info(
             "Token set by %s (%s), expires at %s",
@@ -1,32 +1,85 @@
-import os
 import csv
-import logging
-import traceback
+import asyncio
+from typing import Optional
 
 import discord
 from discord import app_commands, Interaction
 from discord.ext import commands
-from utils.schedule import SCHEDULE
-from dotenv import load_dotenv
-
-load_dotenv()
-
-ADMINS_ROLE_ID = int(os.getenv("ADMINS_ROLE_ID", 0))
-CAPTAINS_ROLE_ID = int(os.getenv("CAPTAINS_ROLE_ID", 0))
-KENTO_USER_ID = int(os.getenv("KENTO_USER_ID", 0))  # ✅ NEW
-
-logger = logging.getLogger("qrls.startweek")
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] %(name)s: %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-logger.setLevel(logging.INFO)
+from utils.env import env_int
+from utils.schedule import SCHEDULE, CHANNEL_NAMES
+from utils.permissions import member_role_ids
+from utils.discord_cache import categories_by_name, category_channel_names, roles_by_name
+from utils.logging import get_logger
+
+ADMINS_ROLE_ID = env_int("ADMINS_ROLE_ID")
+CAPTAINS_ROLE_ID = env_int("CAPTAINS_ROLE_ID")
+KENTO_USER_ID = env_int("KENTO_USER_ID")  # ✅ NEW
+
+logger = get_logger("qrls.startweek")
+
+INTRO_SEND_CONCURRENCY = 5
+INTRO_ALLOWED_MENTIONS = discord.AllowedMentions(roles=True, users=False, everyone=False)
+# Match channel overwrites (shared, never mutated)
+HIDDEN_OVERWRITE = discord.PermissionOverwrite(read_messages=False)
+READ_SEND_OVERWRITE = discord.PermissionOverwrite(read_messages=True, send_messages=True)
+INTRO_FOOTER = (
+    "Please confirm your match time before the deadline. "
+    "Please use /propose to propose a time and /confirm to confirm the proposed time."
+)
+PRESEASON_WEEKS = frozenset((21, 22, 23, 24))
+# Discord rejects channel creation once a category holds this many channels
+CATEGORY_CHANNEL_LIMIT = 50
+# Keeps the final followup under Discord's 2000-char message limit
+CHANNEL_LIST_MAX_CHARS = 1800
+
+
+def _format_channel_list(names: list[str]) -> str:
+    """Bullet list of channel names; trailing names collapse into "…and N more" if too long."""
+    formatted = "\n".join(map("• {}".format, names))
+    if len(formatted) <= CHANNEL_LIST_MAX_CHARS:
+        return formatted
+    lines, used = [], 0
+    for name in names:
+        line = f"• {name}"
+        if used + len(line) + 1 > CHANNEL_LIST_MAX_CHARS:
+            break
+        lines.append(line)
+        used += len(line) + 1
+    lines.append(f"…and {len(names) - len(lines)} more")
+    return "\n".join(lines)
 
 
 class StartWeek(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # Caps intro posts in flight (across all /startweek runs) to stay under the global rate limit
+        self._intro_sem = asyncio.Semaphore(INTRO_SEND_CONCURRENCY)
+
+    async def _post_match_intro(
+        self,
+        new_channel: discord.TextChannel,
+        week_number: int,
+        embed_template: discord.Embed,
+        team_a: str,
+        team_b: str,
+        role_a: Optional[discord.Role],
+        role_b: Optional[discord.Role],
+        captains_mention: str,
+    ):
+        """Posts the captain/team ping and the scheduling embed in a new match channel (one message)."""
+        # ---- Ping captains + BOTH teams ----
+        team_a_mention = role_a.mention if role_a else f"@{team_a}"
+        team_b_mention = role_b.mention if role_b else f"@{team_b}"
+        ping_text = (
+            f"{captains_mention} — {team_a_mention} vs {team_b_mention} — "
+            f"This is your scheduling channel for Week {week_number}."
+        )
+
+        embed = embed_template.copy()
+        embed.add_field(name="🏆 Matchup", value=f"**{team_a}** vs **{team_b}**", inline=False)
+
+        async with self._intro_sem:
+            await new_channel.send(content=ping_text, embed=embed, allowed_mentions=INTRO_ALLOWED_MENTIONS)
 
     @app_commands.command(
         name="startweek",
@@ -37,134 +90,157 @@ class StartWeek(commands.Cog):
     )
     @app_commands.guild_only()
     async def start_week(self, interaction: Interaction, week_number: int):
-        step = "START"
-        try:
-            logger.info("Invoked /startweek %s by user_id=%s", week_number, getattr(interaction.user, "id", None))
+        logger.info("Invoked /startweek %s by user_id=%s", week_number, interaction.user.id)
 
-            step = "DEFER"
-            await interaction.response.defer(ephemeral=True)
+        await interaction.response.defer(ephemeral=True)
 
-            step = "GUILD_CHECK"
-            guild = interaction.guild
-            if guild is None:
-                await interaction.followup.send("❌ This command can only be used in a server.", ephemeral=True)
-                return
+        guild = interaction.guild
+        if guild is None:
+            await interaction.followup.send("❌ This command can only be used in a server.", ephemeral=True)
+            return
 
-            # ---- Make sure we have a Member object (not just a User) ----
-            step = "FETCH_MEMBER"
-            member = interaction.user
-            if not isinstance(member, discord.Member):
-                try:
+        # ---- Make sure we have a Member object (not just a User) ----
+        member = interaction.user
+        if not isinstance(member, discord.Member):
+            try:
+                # Member cache first; only hit the API on a cache miss
+                member = guild.get_member(interaction.user.id)
+                if member is None:
                     member = await guild.fetch_member(interaction.user.id)
                     logger.info("Fetched member from API: %s (%s)", member.name, member.id)
-                except discord.NotFound:
-                    logger.error("fetch_member: user not found in guild")
-                    await interaction.followup.send("❌ Could not find you as a server member.", ephemeral=True)
-                    return
-                except discord.Forbidden:
-                    logger.error("fetch_member: missing permissions (Guild Members intent or perms)")
-                    await interaction.followup.send(
-                        "❌ Bot cannot fetch members (check Guild Members intent + permissions).",
-                        ephemeral=True
-                    )
-                    return
-
-            # ---- Permission check (Admin only) ----
-            step = "PERMISSION_CHECK"
-            has_admin_perm = getattr(member.guild_permissions, "administrator", False)
-            has_admin_role = bool(ADMINS_ROLE_ID and discord.utils.get(member.roles, id=ADMINS_ROLE_ID))
-
-            logger.info("Perm check: admin_perm=%s admin_role=%s ADMINS_ROLE_ID=%s",
-                        has_admin_perm, has_admin_role, ADMINS_ROLE_ID)
-
-            if not (has_admin_perm or has_admin_role):
-                await interaction.followup.send("🚫 You don’t have permission to use this command.", ephemeral=True)
-                return
-
-            # ---- Validate week number ----
-            step = "SCHEDULE_LOOKUP"
-            if week_number not in SCHEDULE:
-                logger.warning("Week %s not in SCHEDULE. Keys=%s", week_number, list(SCHEDULE.keys()))
-                await interaction.followup.send(f"❌ No schedule found for week **{week_number}**.", ephemeral=True)
+            except discord.NotFound:
+                logger.error("fetch_member: user not found in guild")
+                await interaction.followup.send("❌ Could not find you as a server member.", ephemeral=True)
                 return
-
-            matches = SCHEDULE[week_number]
-            logger.info("Matches for week %s: %s", week_number, len(matches))
-
-            # ---- Find/Create category ----
-            step = "CATEGORY_LOOKUP"
-            category_name = "╭────Scheduling────╮"
-            category = discord.utils.get(guild.categories, name=category_name)
-            if not category:
-                step = "CATEGORY_CREATE"
-                logger.info("Creating category: %s", category_name)
-                category = await guild.create_category(category_name)
-            logger.info("Using category id=%s name=%s", category.id, category.name)
-
-            # ----- Captains & Streamer roles lookup (safe) -----
-            step = "ROLES_LOOKUP"
-            logger.info("CAPTAINS_ROLE_ID=%s", CAPTAINS_ROLE_ID)
-            captains_role = guild.get_role(CAPTAINS_ROLE_ID) if CAPTAINS_ROLE_ID else None
-            logger.info("Captains role found=%s", bool(captains_role))
-
-            # Streamer role by name (no pings, just perms)
-            streamer_role = discord.utils.get(guild.roles, name="Streamer")
-            logger.info("Streamer role found=%s", bool(streamer_role))
-
-            # ✅ NEW: Kento member lookup (optional; safe if not found)
-            step = "KENTO_LOOKUP"
-            kento_member = None
-            if KENTO_USER_ID:
-                kento_member = guild.get_member(KENTO_USER_ID)
-                if not kento_member:
-                    try:
-                        kento_member = await guild.fetch_member(KENTO_USER_ID)
-                    except (discord.NotFound, discord.Forbidden):
-                        kento_member = None
-                logger.info("Kento member found=%s KENTO_USER_ID=%s", bool(kento_member), KENTO_USER_ID)
-
-            created_channels = []
-
-            for idx, (team_a, team_b) in enumerate(matches, start=1):
-                step = "BUILD_CHANNEL_NAME"
-                channel_name = (
-                    f"week{week_number}-{team_a.lower().replace(' ', '-')}-vs-{team_b.lower().replace(' ', '-')}"
+            except discord.Forbidden:
+                logger.error("fetch_member: missing permissions (Guild Members intent or perms)")
+                await interaction.followup.send(
+                    "❌ Bot cannot fetch members (check Guild Members intent + permissions).",
+                    ephemeral=True
                 )
+                return
 
-                step = "CHECK_EXISTING_CHANNEL"
-                if discord.utils.get(category.text_channels, name=channel_name):
-                    logger.info("Exists, skipping: %s", channel_name)
+        # ---- Permission check (Admin only) ----
+        has_admin_perm = getattr(member.guild_permissions, "administrator", False)
+        has_admin_role = bool(ADMINS_ROLE_ID and ADMINS_ROLE_ID in member_role_ids(member))
+
+        logger.debug("Perm check: admin_perm=%s admin_role=%s ADMINS_ROLE_ID=%s",
+                     has_admin_perm, has_admin_role, ADMINS_ROLE_ID)
+
+        if not (has_admin_perm or has_admin_role):
+            await interaction.followup.send("🚫 You don’t have permission to use this command.", ephemeral=True)
+            return
+
+        # ---- Validate week number ----
+        if week_number not in SCHEDULE:
+            logger.warning("Week %s not in SCHEDULE. Keys=%s", week_number, list(SCHEDULE.keys()))
+            await interaction.followup.send(f"❌ No schedule found for week **{week_number}**.", ephemeral=True)
+            return
+
+        matches = CHANNEL_NAMES[week_number]
+        logger.debug("Matches for week %s: %s", week_number, len(matches))
+
+        # ---- Find/Create category ----
+        category_name = "╭────Scheduling────╮"
+        category = categories_by_name(guild).get(category_name)
+        if not category:
+            logger.info("Creating category: %s", category_name)
+            category = await guild.create_category(category_name)
+        logger.debug("Using category id=%s name=%s", category.id, category.name)
+
+        # ---- Existing channel names (new ones are added as they're created) ----
+        existing_channel_names = set(category_channel_names(category))
+        pending = [match for match in matches if match[2] not in existing_channel_names]
+        logger.debug("Pending channels for week %s: %s/%s", week_number, len(pending), len(matches))
+
+        # Nothing to create: skip the role/member lookups entirely
+        if not pending:
+            await interaction.followup.send(
+                f"ℹ️ All Week {week_number} channels already exist.",
+                ephemeral=True
+            )
+            return
+
+        # Fail up front instead of part-way through the week with a 400 from Discord
+        free_slots = CATEGORY_CHANNEL_LIMIT - len(category.channels)
+        if len(pending) > free_slots:
+            await interaction.followup.send(
+                f"❌ **{category.name}** has room for {max(free_slots, 0)} more channel(s), "
+                f"but Week {week_number} needs {len(pending)}. Clear out old channels first.",
+                ephemeral=True
+            )
+            return
+
+        # ----- Captains & Streamer roles lookup (safe) -----
+        logger.debug("CAPTAINS_ROLE_ID=%s", CAPTAINS_ROLE_ID)
+        captains_role = guild.get_role(CAPTAINS_ROLE_ID) if CAPTAINS_ROLE_ID else None
+        logger.debug("Captains role found=%s", bool(captains_role))
+
+        # Streamer role by name (no pings, just perms)
+        guild_roles = roles_by_name(guild)
+        streamer_role = guild_roles.get("Streamer")
+        logger.debug("Streamer role found=%s", bool(streamer_role))
+
+        # ✅ NEW: Kento member lookup (optional; safe if not found)
+        kento_member = None
+        if KENTO_USER_ID:
+            kento_member = guild.get_member(KENTO_USER_ID)
+            if not kento_member:
+                try:
+                    kento_member = await guild.fetch_member(KENTO_USER_ID)
+                except (discord.NotFound, discord.Forbidden):
+                    kento_member = None
+            logger.debug("Kento member found=%s KENTO_USER_ID=%s", bool(kento_member), KENTO_USER_ID)
+
+        # ---- Overwrites shared by every match channel (built once) ----
+        base_overwrites = {guild.default_role: HIDDEN_OVERWRITE}
+        shared_overwrites = {}
+        # Streamer role read/send access in every scheduling channel
+        if streamer_role:
+            shared_overwrites[streamer_role] = READ_SEND_OVERWRITE
+        # ✅ NEW: Kento gets read/send access in every scheduling channel
+        if kento_member:
+            shared_overwrites[kento_member] = READ_SEND_OVERWRITE
+
+        # ---- Intro message parts shared by every match this week ----
+        captains_mention = captains_role.mention if captains_role else "@Captains"
+        # Title/description/footer are the same for every match; each channel copies this and adds its matchup
+        embed_template = discord.Embed(
+            title=f"📅 Week {week_number} Scheduling",
+            description=(
+                "This is your scheduling channel for round 1 of the preseason tournament."
+                if week_number in PRESEASON_WEEKS
+                else f"This is your scheduling channel for **Week {week_number}**."
+            ),
+            color=discord.Color.blue()
+        )
+        embed_template.set_footer(text=INTRO_FOOTER)
+
+        created_channels = []
+        intro_tasks: list[asyncio.Task] = []
+
+        # If creation fails part-way, still collect the intros already in flight and say what was created
+        stopped = False
+        try:
+            for team_a, team_b, channel_name in pending:
+                if channel_name in existing_channel_names:
+                    logger.debug("Exists, skipping: %s", channel_name)
                     continue
 
-                step = "BUILD_OVERWRITES"
-                overwrites = {guild.default_role: discord.PermissionOverwrite(read_messages=False)}
-
-                role_a = discord.utils.get(guild.roles, name=team_a)
-                role_b = discord.utils.get(guild.roles, name=team_b)
-
-                logger.info("Team roles: %s=%s | %s=%s", team_a, bool(role_a), team_b, bool(role_b))
+                role_a = guild_roles.get(team_a)
+                role_b = guild_roles.get(team_b)
+                if role_a is None or role_b is None:
+                    logger.debug("Missing team role(s) for %s: %s", channel_name,
+                                 [t for t, r in ((team_a, role_a), (team_b, role_b)) if r is None])
 
-                if role_a:
-                    overwrites[role_a] = discord.PermissionOverwrite(read_messages=True, send_messages=True)
-                if role_b:
-                    overwrites[role_b] = discord.PermissionOverwrite(read_messages=True, send_messages=True)
+                # Streamer role + Kento keep read/send access (applied after team roles, as before)
+                overwrites = {
+                    **base_overwrites,
+                    **{role: READ_SEND_OVERWRITE for role in (role_a, role_b) if role is not None},
+                    **shared_overwrites,
+                }
 
-                # Streamer role read/send access in every scheduling channel
-                if streamer_role:
-                    overwrites[streamer_role] = discord.PermissionOverwrite(
-                        read_messages=True,
-                        send_messages=True
-                    )
-
-                # ✅ NEW: Kento gets read/send access in every scheduling channel
-                if kento_member:
-                    overwrites[kento_member] = discord.PermissionOverwrite(
-                        read_messages=True,
-                        send_messages=True
-                    )
-
-                step = "CREATE_CHANNEL"
-                logger.info("Creating channel: %s", channel_name)
+                logger.debug("Creating channel: %s", channel_name)
                 new_channel = await guild.create_text_channel(
                     name=channel_name,
                     category=category,
@@ -172,81 +248,59 @@ class StartWeek(commands.Cog):
                     reason=f"Week {week_number} matchup setup"
                 )
                 created_channels.append(new_channel.name)
-
-                # ---- First message: ping captains + BOTH teams ----
-                step = "SEND_PING"
-                allowed_mentions = discord.AllowedMentions(roles=True, users=False, everyone=False)
-
-                team_a_mention = role_a.mention if role_a else f"@{team_a}"
-                team_b_mention = role_b.mention if role_b else f"@{team_b}"
-
-                if captains_role:
-                    await new_channel.send(
-                        content=(
-                            f"{captains_role.mention} — {team_a_mention} vs {team_b_mention} — "
-                            f"This is your scheduling channel for Week {week_number}."
-                        ),
-                        allowed_mentions=allowed_mentions
-                    )
-                else:
-                    await new_channel.send(
-                        content=(
-                            f"@Captains — {team_a_mention} vs {team_b_mention} — "
-                            f"This is your scheduling channel for Week {week_number}."
-                        ),
-                        allowed_mentions=allowed_mentions
-                    )
-
-                step = "SEND_EMBED"
-                embed_description = (
-                    "This is your scheduling channel for round 1 of the preseason tournament."
-                    if week_number in (21, 22, 23, 24)
-                    else f"This is your scheduling channel for **Week {week_number}**."
-                )
-
-                embed = discord.Embed(
-                    title=f"📅 Week {week_number} Scheduling",
-                    description=embed_description,
-                    color=discord.Color.blue()
-                )
-                embed.add_field(name="🏆 Matchup", value=f"**{team_a}** vs **{team_b}**", inline=False)
-                embed.set_footer(
-                    text=(
-                        "Please confirm your match time before the deadline. "
-                        "Please use /propose to propose a time and /confirm to confirm the proposed time."
-                    )
-                )
-                await new_channel.send(embed=embed)
-
-            step = "FINAL_RESPONSE"
-            if created_channels:
-                formatted = "\n".join(f"• {c}" for c in created_channels)
-                await interaction.followup.send(
-                    f"✅ Created {len(created_channels)} channel(s) for **Week {week_number}**:\n{formatted}",
-                    ephemeral=True
-                )
-            else:
-                await interaction.followup.send(
-                    f"ℹ️ All Week {week_number} channels already exist.",
-                    ephemeral=True
-                )
-
-        except Exception as e:
-            logger.error("ERROR at step=%s: %r", step, e)
-            traceback.print_exc()
-            try:
-                if interaction.response.is_done():
-                    await interaction.followup.send(
-                        f"❌ /startweek failed at step: **{step}** (check bot console for traceback).",
-                        ephemeral=True
-                    )
-                else:
-                    await interaction.response.send_message(
-                        f"❌ /startweek failed at step: **{step}** (check bot console for traceback).",
-                        ephemeral=True
-                    )
-            except discord.HTTPException:
-                pass
+                existing_channel_names.add(new_channel.name)
+
+                # ---- Intro messages go out concurrently while the next channel is created ----
+                intro_tasks.append(asyncio.create_task(self._post_match_intro(
+                    new_channel, week_number, embed_template, team_a, team_b, role_a, role_b, captains_mention
+                )))
+        except Exception:
+            # Nothing created yet: the error handlers report it like any other failure
+            if not created_channels:
+                raise
+            # Channels exist: the partial report below is the only reply (the error is not re-raised)
+            logger.exception("/startweek %s stopped after creating %s channel(s)", week_number, len(created_channels))
+            stopped = True
+        finally:
+            results = await asyncio.gather(*intro_tasks, return_exceptions=True)
+            failed_intros = 0
+            for result in results:
+                if isinstance(result, BaseException):
+                    failed_intros += 1
+                    logger.error("Failed posting intro message: %r", result,
+                                 exc_info=(type(result), result, result.__traceback__))
+
+        logger.info("Completed /startweek %s: created %s channel(s), %s intro failure(s)",
+                    week_number, len(created_channels), failed_intros)
+
+        warning = (
+            f"\n⚠️ {failed_intros} intro message(s) failed to post (check bot console)."
+            if failed_intros else ""
+        )
+        if stopped:
+            await interaction.followup.send(
+                f"⚠️ /startweek stopped after creating {len(created_channels)} channel(s) "
+                f"for **Week {week_number}** (check bot console):\n{_format_channel_list(created_channels)}{warning}",
+                ephemeral=True
+            )
+        elif created_channels:
+            formatted = _format_channel_list(created_channels)
+            await interaction.followup.send(
+                f"✅ Created {len(created_channels)} channel(s) for **Week {week_number}**:\n{formatted}{warning}",
+                ephemeral=True
+            )
+        else:
+            await interaction.followup.send(
+                f"ℹ️ All Week {week_number} channels already exist.",
+                ephemeral=True
+            )
+
+    @start_week.error
+    async def start_week_error(self, interaction: Interaction, error: app_commands.AppCommandError):
+        # The global tree error handler replies to the user; this only adds the traceback
+        original = getattr(error, "original", error)
+        logger.error("/startweek failed: %r", original,
+                     exc_info=(type(original), original, original.__traceback__))
 
 
 async def setup(bot):
@@ -1,10 +1,11 @@
 import os
 import json
-import logging
 import traceback
 import asyncio
+import heapq
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta, time
+from time import monotonic, time as epoch_time
 from zoneinfo import ZoneInfo
 
 import discord
@@ -15,21 +16,19 @@ from dotenv import load_dotenv
 import gspread
 from google.oauth2.service_account import Credentials
 
-from utils.team_info import TEAM_INFO
+from utils.team_info import TEAM_NAME_BY_ROLE_ID, get_team_role_id
+from utils.logging import get_logger
 
 
 load_dotenv()
 
-logger = logging.getLogger("qrls.sub")
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] %(name)s: %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-logger.setLevel(logging.INFO)
+logger = get_logger("qrls.sub")
 
 EASTERN = ZoneInfo("America/New_York")
 
+# How long a sheet read is reused by later /sub calls (captains often file several in a row)
+TEAM_INDEX_TTL_SECONDS = 30.0
+
 
 def _get_env_int(name: str) -> Optional[int]:
     v = os.getenv(name)
@@ -45,27 +44,21 @@ def _normalize(s: str) -> str:
     return (s or "").strip()
 
 
-def _is_free_agent(value: str) -> bool:
-    return _normalize(value).lower() == "free agent"
+FREE_AGENT_TEAM = "free agent"
 
 
-def _get_team_role_id(team_name: str) -> Optional[int]:
-    info = TEAM_INFO.get(team_name)
-    if not isinstance(info, dict):
-        return None
-    role_id = info.get("id")
-    if isinstance(role_id, int):
-        return role_id
-    if isinstance(role_id, str) and role_id.isdigit():
-        return int(role_id)
-    return None
+def _same_team(a: str, b: str) -> bool:
+    # Teams come from _read_team_index, already stripped
+    return a.casefold() == b.casefold()
+
+
+def _is_free_agent(team: str) -> bool:
+    # Teams come from _read_team_index, already stripped
+    return team.casefold() == FREE_AGENT_TEAM
 
 
 def _get_team_name_from_role_id(role_id: int) -> Optional[str]:
-    for team_name, info in TEAM_INFO.items():
-        if isinstance(info, dict) and info.get("id") == role_id:
-            return team_name
-    return None
+    return TEAM_NAME_BY_ROLE_ID.get(role_id)
 
 
 def _next_sunday_2359(now_et: datetime) -> datetime:
@@ -117,18 +110,43 @@ class Sub(commands.Cog):
         self.sheet_id = os.getenv("GOOGLE_SHEET_ID", "")
         self.worksheet_name = os.getenv("GOOGLE_WORKSHEET", "")
 
+        # Authorized once and reused; _ws is reset if a read fails so it gets reopened
+        self._gc: Optional[gspread.Client] = None
+        self._ws: Optional[gspread.Worksheet] = None
+        self._team_index: Optional[Dict[str, str]] = None
+        self._team_rows: Dict[str, int] = {}
+        self._team_index_at = 0.0
+        self._team_index_lock = asyncio.Lock()
+        # Bumped on every roster write; a read that started before the bump is not cached
+        self._team_index_gen = 0
+
         # Sheet columns: A=Discord ID, D=Team
         self.COL_DISCORD_ID = 0
         self.COL_TEAM = 3
+        self._index_ranges = [
+            f"{col}:{col}"
+            for col in (
+                gspread.utils.rowcol_to_a1(1, self.COL_DISCORD_ID + 1)[:-1],
+                gspread.utils.rowcol_to_a1(1, self.COL_TEAM + 1)[:-1],
+            )
+        ]
 
         # Persistence
         self.subs_path = os.path.join("data", "subs.json")
         self._subs_lock = asyncio.Lock()
-        self._removal_tasks: Dict[str, asyncio.Task] = {}
+        # Pending role removals: one worker sleeps until the earliest expiry (heap of (timestamp, key))
+        self._expiry_heap: List[tuple[float, str]] = []
+        self._pending_removals: Dict[str, tuple[int, int, int, Optional[Dict[str, Any]]]] = {}
+        self._expiry_wakeup = asyncio.Event()
+        self._expiry_worker: Optional[asyncio.Task] = None
 
         # Kick off rehydration ASAP
         self.bot.loop.create_task(self._rehydrate_subs())
 
+    async def cog_unload(self):
+        if self._expiry_worker is not None:
+            self._expiry_worker.cancel()
+
     # ---------------------------
     # Helpers: Permissions
     # ---------------------------
@@ -142,6 +160,10 @@ class Sub(commands.Cog):
             return True
         return False
 
+    async def _resolve_member(self, guild: discord.Guild, user_id: int) -> discord.Member:
+        """Member cache first; one fetch_member (REST) only on a miss. Raises NotFound/Forbidden like fetch_member."""
+        return guild.get_member(user_id) or await guild.fetch_member(user_id)
+
     # ---------------------------
     # Helpers: Google Sheet
     # ---------------------------
@@ -176,23 +198,105 @@ class Sub(commands.Cog):
         if not self.worksheet_name:
             raise RuntimeError("GOOGLE_WORKSHEET is missing from .env")
 
-        gc = self._get_gspread_client()
-        sh = gc.open_by_key(self.sheet_id)
-        return sh.worksheet(self.worksheet_name)
+        if self._ws is not None:
+            return self._ws
 
-    def _find_row_index_by_discord_id(self, values: list[list[str]], discord_id: int) -> Optional[int]:
+        if self._gc is None:
+            self._gc = self._get_gspread_client()
+        sh = self._gc.open_by_key(self.sheet_id)
+        self._ws = sh.worksheet(self.worksheet_name)
+        return self._ws
+
+    def _read_team_index(self, ws) -> tuple[Dict[str, str], Dict[str, int]]:
         """
-        Returns 1-based row index for gspread.
+        Discord ID -> team (Column A -> Column D) from one batchGet of just those two columns,
+        plus Discord ID -> 1-based row so Approve can re-read just those rows later.
+        The first row with a given Discord ID wins; a found player with a blank team maps to "".
+        Both columns are stripped here once, so callers compare the values as-is.
         """
-        target = str(discord_id)
-        for i, row in enumerate(values, start=1):
-            if len(row) > self.COL_DISCORD_ID and _normalize(row[self.COL_DISCORD_ID]) == target:
-                return i
-        return None
+        try:
+            id_col, team_col = ws.batch_get(self._index_ranges)
+        except gspread.exceptions.APIError:
+            # Worksheet may have been renamed/deleted; reopen it next time
+            self._ws = None
+            raise
+
+        index: Dict[str, str] = {}
+        rows: Dict[str, int] = {}
+        team_count = len(team_col)
+        for i, row in enumerate(id_col):
+            discord_id = _normalize(row[0]) if row else ""
+            if not discord_id or discord_id in index:
+                continue
+            team_row = team_col[i] if i < team_count else None
+            index[discord_id] = _normalize(team_row[0]) if team_row else ""
+            rows[discord_id] = i + 1
+        return index, rows
 
-    def _get_team_from_row(self, values: list[list[str]], row_index_1based: int) -> str:
-        row = values[row_index_1based - 1]
-        return _normalize(row[self.COL_TEAM]) if len(row) > self.COL_TEAM else ""
+    def _read_team_rows(self, ws, rows: Dict[str, int]) -> Optional[Dict[str, str]]:
+        """
+        Re-reads only the given rows (one batchGet) and returns Discord ID -> team for them.
+        Returns None if any row no longer holds the expected Discord ID (rows moved/deleted).
+        """
+        id_col = self.COL_DISCORD_ID + 1
+        team_col = self.COL_TEAM + 1
+        ranges = [
+            f"{gspread.utils.rowcol_to_a1(row, id_col)}:{gspread.utils.rowcol_to_a1(row, team_col)}"
+            for row in rows.values()
+        ]
+        try:
+            results = ws.batch_get(ranges)
+        except gspread.exceptions.APIError:
+            self._ws = None
+            raise
+
+        team_offset = team_col - id_col
+        index: Dict[str, str] = {}
+        for discord_id, values in zip(rows, results):
+            cells = values[0] if values else []
+            if not cells or _normalize(cells[0]) != discord_id:
+                return None
+            index[discord_id] = _normalize(cells[team_offset]) if len(cells) > team_offset else ""
+        return index
+
+    async def _get_team_index(self, max_age: float = TEAM_INDEX_TTL_SECONDS) -> Dict[str, str]:
+        """
+        Cached _read_team_index. Concurrent callers share one sheet read;
+        pass max_age=0 to force a fresh read (the result still refreshes the cache).
+        """
+        async with self._team_index_lock:
+            if self._team_index is not None and monotonic() - self._team_index_at < max_age:
+                return self._team_index
+            # gspread is blocking (auth, open_by_key, batch_get); keep it off the event loop
+            gen = self._team_index_gen
+            ws = await asyncio.to_thread(self._open_worksheet)
+            index, rows = await asyncio.to_thread(self._read_team_index, ws)
+            self._team_index, self._team_rows = index, rows
+            # A write landed mid-read: use this result once, but don't serve it from the cache
+            self._team_index_at = monotonic() if gen == self._team_index_gen else 0.0
+            return index
+
+    async def _recheck_team_rows(self, rows: Dict[str, int]) -> Dict[str, str]:
+        """
+        Fresh teams for the players in `rows` (Discord ID -> row from the /sub-time index).
+        Reads only those rows; falls back to a full index read if any of them moved.
+        """
+        ws = await asyncio.to_thread(self._open_worksheet)
+        index = await asyncio.to_thread(self._read_team_rows, ws, rows)
+        if index is None:
+            logger.info("Sheet rows moved since /sub; re-reading the full index")
+            index = await self._get_team_index(max_age=0)
+        return index
+
+    @commands.Cog.listener()
+    async def on_roster_sheet_updated(self):
+        """
+        Dispatched (bot.dispatch("roster_sheet_updated")) by every cog that writes the roster sheet
+        (/add, /drop, /trade, /retire, /unretire, /updateuser, waiver claims), so /sub never
+        validates against a cached index from before the write.
+        """
+        self._team_index = None
+        self._team_index_gen += 1
 
     # ---------------------------
     # Helpers: Messaging
@@ -216,7 +320,7 @@ class Sub(commands.Cog):
             logger.warning("TRANSACTIONS_CHANNEL_ID does not resolve to a text channel; skipping.")
             return
 
-        team_role_id = _get_team_role_id(team_name)
+        team_role_id = get_team_role_id(team_name)
         team_text = f"<@&{team_role_id}>" if team_role_id else f"**{team_name}**"
 
         await ch.send(f"{team_text} signs {player2.mention} in place of {player1.mention} on a sub deal for the week.")
@@ -226,10 +330,12 @@ class Sub(commands.Cog):
         guild: discord.Guild,
         user_id: int,
         role_id: int,
-        record: Optional[Dict[str, Any]] = None
+        record: Optional[Dict[str, Any]] = None,
+        member: Optional[discord.Member] = None
     ):
         """
         Log to CHANGELOG_CHANNEL_ID when a temp sub role is removed by the bot.
+        Pass the already-resolved member when available to skip the lookup.
         """
         if not self.changelog_channel_id:
             return
@@ -238,9 +344,8 @@ class Sub(commands.Cog):
         if not isinstance(ch, discord.TextChannel):
             return
 
-        member = guild.get_member(user_id)
-        # Use role mention if possible
-        role = guild.get_role(role_id)
+        if member is None:
+            member = guild.get_member(user_id)
 
         # Best-effort names from record
         team_name = None
@@ -249,7 +354,7 @@ class Sub(commands.Cog):
         if not team_name:
             team_name = _get_team_name_from_role_id(role_id)
 
-        team_role_id = _get_team_role_id(team_name) if team_name else None
+        team_role_id = get_team_role_id(team_name) if team_name else None
         team_text = f"<@&{team_role_id}>" if team_role_id else (f"**{team_name}**" if team_name else f"role_id={role_id}")
         player_text = member.mention if isinstance(member, discord.Member) else f"<@{user_id}>"
 
@@ -346,11 +451,7 @@ class Sub(commands.Cog):
                 key = rec.get("_key") or self._make_sub_key(guild_id, user_id, role_id, rec["expires_at"])
                 rec["_key"] = key
 
-                now_et = datetime.now(EASTERN)
-                if expires_at <= now_et:
-                    self.bot.loop.create_task(self._remove_role_and_cleanup(guild_id, user_id, role_id, key, rec))
-                    continue
-
+                # Already-expired records are due immediately; the expiry worker handles them first
                 self._schedule_removal(guild_id, user_id, role_id, expires_at, key, rec)
             except Exception as e:
                 logger.error("Bad sub record in file: %r | %r", e, rec)
@@ -366,21 +467,49 @@ class Sub(commands.Cog):
         key: str,
         record: Optional[Dict[str, Any]] = None
     ):
-        if key in self._removal_tasks and not self._removal_tasks[key].done():
+        if key in self._pending_removals:
             return
 
-        seconds = max(0, (expires_at - datetime.now(EASTERN)).total_seconds())
+        self._pending_removals[key] = (guild_id, user_id, role_id, record)
+        heapq.heappush(self._expiry_heap, (expires_at.timestamp(), key))
+        self._expiry_wakeup.set()
+        if self._expiry_worker is None or self._expiry_worker.done():
+            self._expiry_worker = self.bot.loop.create_task(self._expiry_loop())
+
+        seconds = max(0, expires_at.timestamp() - epoch_time())
+        logger.info("Scheduled sub role removal key=%s in %ss", key, int(seconds))
+
+    async def _expiry_loop(self):
+        """
+        Single worker for every pending removal: sleeps until the earliest expiry,
+        waking early whenever _schedule_removal pushes something new.
+        """
+        while True:
+            self._expiry_wakeup.clear()
+            if not self._expiry_heap:
+                await self._expiry_wakeup.wait()
+                continue
 
-        async def _job():
+            due_at, key = self._expiry_heap[0]
+            delay = due_at - epoch_time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._expiry_wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                # Re-check the head: a sooner expiry may have been pushed
+                continue
+
+            heapq.heappop(self._expiry_heap)
+            pending = self._pending_removals.pop(key, None)
+            if pending is None:
+                # Already cleaned up elsewhere
+                continue
+            guild_id, user_id, role_id, record = pending
             try:
-                await asyncio.sleep(seconds)
                 await self._remove_role_and_cleanup(guild_id, user_id, role_id, key, record)
-            except Exception as e:
-                logger.error("Scheduled removal job failed: %r", e)
-                traceback.print_exc()
-
-        self._removal_tasks[key] = self.bot.loop.create_task(_job())
-        logger.info("Scheduled sub role removal key=%s in %ss", key, int(seconds))
+            except Exception:
+                logger.exception("Scheduled removal job failed: key=%s", key)
 
     async def _remove_role_and_cleanup(
         self,
@@ -405,10 +534,9 @@ class Sub(commands.Cog):
             return
 
         removed = False
+        member: Optional[discord.Member] = None
         try:
-            member = guild.get_member(user_id)
-            if member is None:
-                member = await guild.fetch_member(user_id)
+            member = await self._resolve_member(guild, user_id)
 
             if role in member.roles:
                 await member.remove_roles(role, reason="/sub expired: remove temporary sub role")
@@ -426,14 +554,13 @@ class Sub(commands.Cog):
             # ✅ Changelog only when bot actually removed the role
             if removed:
                 try:
-                    await self._post_changelog_expiration(guild, user_id, role_id, record)
+                    await self._post_changelog_expiration(guild, user_id, role_id, record, member)
                 except Exception as e:
                     logger.error("Changelog post failed: %r", e)
 
             await self._remove_sub_record_by_key(key)
-            t = self._removal_tasks.pop(key, None)
-            if t and not t.done():
-                t.cancel()
+            # Any heap entry left for this key is skipped by the worker
+            self._pending_removals.pop(key, None)
 
     # ----------------------------
     # Approval View
@@ -450,6 +577,7 @@ class Sub(commands.Cog):
             player2_id: int,
             player2_display: str,
             expires_at: datetime,
+            sheet_rows: Dict[str, int],
         ):
             super().__init__(timeout=60 * 60 * 24)  # 24 hour
             self.cog = cog
@@ -463,6 +591,8 @@ class Sub(commands.Cog):
             self.player2_display = player2_display
 
             self.expires_at = expires_at
+            # Discord ID -> sheet row for the captain and both players, as of the /sub request
+            self.sheet_rows = sheet_rows
             self.decided = False
 
         async def _finalize_buttons(self, interaction: discord.Interaction, status_text: str):
@@ -533,12 +663,11 @@ class Sub(commands.Cog):
                         pass
                     return
 
-                # Re-check sheet conditions:
-                ws = self.cog._open_worksheet()
-                values = ws.get_all_values()
+                # Re-check sheet conditions (always a fresh read of just these rows; the sheet may have changed since /sub)
+                team_by_id = await self.cog._recheck_team_rows(self.sheet_rows)
 
-                cap_row = self.cog._find_row_index_by_discord_id(values, self.captain_id)
-                if not cap_row:
+                cap_team_current = team_by_id.get(str(self.captain_id))
+                if cap_team_current is None:
                     await self.cog._post_in_origin_channel(self.origin_channel_id, "❌ Sub approval failed (captain not found in sheet).")
                     await self._finalize_buttons(interaction, "❌ Failed (captain not found in sheet).")
                     try:
@@ -547,8 +676,7 @@ class Sub(commands.Cog):
                         pass
                     return
 
-                cap_team_current = self.cog._get_team_from_row(values, cap_row)
-                if _normalize(cap_team_current) != _normalize(self.captain_team):
+                if not _same_team(cap_team_current, self.captain_team):
                     await self.cog._post_in_origin_channel(
                         self.origin_channel_id,
                         f"🚫 Sub auto-rejected: captain team changed (was **{self.captain_team}**, now **{cap_team_current or 'Unknown'}**)."
@@ -560,8 +688,8 @@ class Sub(commands.Cog):
                         pass
                     return
 
-                p1_row = self.cog._find_row_index_by_discord_id(values, self.player1_id)
-                if not p1_row:
+                p1_team = team_by_id.get(str(self.player1_id))
+                if p1_team is None:
                     await self.cog._post_in_origin_channel(self.origin_channel_id, "🚫 Sub auto-rejected: player being subbed is no longer in the sheet.")
                     await self._finalize_buttons(interaction, "🚫 Auto-rejected (player1 not in sheet).")
                     try:
@@ -570,8 +698,7 @@ class Sub(commands.Cog):
                         pass
                     return
 
-                p1_team = self.cog._get_team_from_row(values, p1_row)
-                if _normalize(p1_team) != _normalize(self.captain_team):
+                if not _same_team(p1_team, self.captain_team):
                     await self.cog._post_in_origin_channel(
                         self.origin_channel_id,
                         f"🚫 Sub auto-rejected: {self.player1_display} is not on **{self.captain_team}** (currently **{p1_team or 'Unknown'}**)."
@@ -583,8 +710,8 @@ class Sub(commands.Cog):
                         pass
                     return
 
-                p2_row = self.cog._find_row_index_by_discord_id(values, self.player2_id)
-                if not p2_row:
+                p2_team = team_by_id.get(str(self.player2_id))
+                if p2_team is None:
                     await self.cog._post_in_origin_channel(self.origin_channel_id, "🚫 Sub auto-rejected: player subbing in is no longer in the sheet.")
                     await self._finalize_buttons(interaction, "🚫 Auto-rejected (player2 not in sheet).")
                     try:
@@ -593,7 +720,6 @@ class Sub(commands.Cog):
                         pass
                     return
 
-                p2_team = self.cog._get_team_from_row(values, p2_row)
                 if not _is_free_agent(p2_team):
                     await self.cog._post_in_origin_channel(
                         self.origin_channel_id,
@@ -606,7 +732,7 @@ class Sub(commands.Cog):
                         pass
                     return
 
-                team_role_id = _get_team_role_id(self.captain_team)
+                team_role_id = get_team_role_id(self.captain_team)
                 if not team_role_id:
                     await self.cog._post_in_origin_channel(
                         self.origin_channel_id,
@@ -632,8 +758,11 @@ class Sub(commands.Cog):
                         pass
                     return
 
-                player1_member = guild.get_member(self.player1_id) or await guild.fetch_member(self.player1_id)
-                player2_member = guild.get_member(self.player2_id) or await guild.fetch_member(self.player2_id)
+                # Resolved once here and reused for the role add, the transaction log and the messages
+                player1_member, player2_member = await asyncio.gather(
+                    self.cog._resolve_member(guild, self.player1_id),
+                    self.cog._resolve_member(guild, self.player2_id),
+                )
 
                 # Add role now
                 try:
@@ -798,45 +927,42 @@ class Sub(commands.Cog):
             now_et = datetime.now(EASTERN)
             expires_at = _next_sunday_2359(now_et)
 
-            # Open sheet + validate
-            step = "OPEN_SHEET"
-            ws = self._open_worksheet()
-
-            step = "READ_ALL"
-            values = ws.get_all_values()
-            if not values:
+            # Read sheet (cached briefly) + validate
+            step = "READ_INDEX"
+            team_by_id = await self._get_team_index()
+            # Same snapshot as team_by_id (the dicts are replaced together, never mutated)
+            team_rows = self._team_rows
+            if not team_by_id:
                 await interaction.followup.send("❌ Worksheet is empty.", ephemeral=True)
                 return
 
             # Captain row + team
             step = "FIND_CAPTAIN_ROW"
-            captain_row = self._find_row_index_by_discord_id(values, interaction.user.id)
-            if not captain_row:
+            captain_team = team_by_id.get(str(interaction.user.id))
+            if captain_team is None:
                 await interaction.followup.send("❌ You (captain) are not found in the Google Sheet (Column A).", ephemeral=True)
                 return
 
-            captain_team = self._get_team_from_row(values, captain_row)
             if not captain_team:
                 await interaction.followup.send("❌ Your team name is blank in Column D for your row in the Google Sheet.", ephemeral=True)
                 return
 
             # Team role must exist
             step = "TEAM_ROLE_VALIDATE"
-            team_role_id = _get_team_role_id(captain_team)
+            team_role_id = get_team_role_id(captain_team)
             if not team_role_id:
                 await interaction.followup.send(f"❌ TEAM_INFO is missing a valid role `id` for your team: **{captain_team}**.", ephemeral=True)
                 return
 
             # Player1 must be on captain team
             step = "FIND_PLAYER1_ROW"
-            p1_row = self._find_row_index_by_discord_id(values, player1.id)
-            if not p1_row:
+            p1_team = team_by_id.get(str(player1.id))
+            if p1_team is None:
                 await interaction.followup.send(f"❌ `{player1.display_name}` is not found in the Google Sheet (Column A).", ephemeral=True)
                 return
 
-            p1_team = self._get_team_from_row(values, p1_row)
             step = "VALIDATE_PLAYER1_TEAM"
-            if _normalize(p1_team) != _normalize(captain_team):
+            if not _same_team(p1_team, captain_team):
                 await interaction.followup.send(
                     f"🚫 You can only sub in place of someone on your own team. {player1.mention} is currently on **{p1_team or 'Unknown'}**.",
                     ephemeral=True
@@ -845,12 +971,11 @@ class Sub(commands.Cog):
 
             # Player2 must be Free Agent
             step = "FIND_PLAYER2_ROW"
-            p2_row = self._find_row_index_by_discord_id(values, player2.id)
-            if not p2_row:
+            p2_team = team_by_id.get(str(player2.id))
+            if p2_team is None:
                 await interaction.followup.send(f"❌ `{player2.display_name}` is not found in the Google Sheet (Column A).", ephemeral=True)
                 return
 
-            p2_team = self._get_team_from_row(values, p2_row)
             step = "VALIDATE_PLAYER2_FREE_AGENT"
             if not _is_free_agent(p2_team):
                 await interaction.followup.send(
@@ -878,7 +1003,11 @@ class Sub(commands.Cog):
                 player1_display=player1.display_name,
                 player2_id=player2.id,
                 player2_display=player2.display_name,
-                expires_at=expires_at
+                expires_at=expires_at,
+                sheet_rows={
+                    str(discord_id): team_rows[str(discord_id)]
+                    for discord_id in (interaction.user.id, player1.id, player2.id)
+                },
             )
 
             admins_role_mention = f"<@&{self.admins_role_id}>"
@@ -3,24 +3,18 @@ from discord import app_commands, Interaction
 from discord.ext import commands
 import csv
 import os
-import logging
 import traceback
 
 from utils.team_info import TEAM_INFO
 from utils.global_cooldown import check_cooldown
+from utils.logging import get_logger
 
 CSV_FILE = "data/salaries.csv"
 
 DEFAULT_COLOR = 0x7289DA  # Discord blurple
 DEFAULT_LOGO = "https://example.com/logos/default_team.png"  # fallback logo
 
-logger = logging.getLogger("qrls.teaminfo")
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] %(name)s: %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-logger.setLevel(logging.INFO)
+logger = get_logger("qrls.teaminfo")
 
 
 async def team_name_autocomplete(interaction: Interaction, current: str):
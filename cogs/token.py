@@ -1,6 +1,5 @@
 import os
 import json
-import logging
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
@@ -9,15 +8,11 @@ from discord import app_commands, Interaction
 from discord.ext import commands
 from dotenv import load_dotenv
 
+from utils.logging import get_logger
+
 load_dotenv()
 
-logger = logging.getLogger("qrls.token")
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] %(name)s: %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-logger.setLevel(logging.INFO)
+logger = get_logger("qrls.token")
 
 DATA_DIR = "data"
 TOKEN_STORE_FILE = os.path.join(DATA_DIR, "token_store.json")
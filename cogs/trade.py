@@ -1,6 +1,5 @@
 import os
 import json
-import logging
 import traceback
 from typing import Optional
 
@@ -13,16 +12,12 @@ import gspread
 from google.oauth2.service_account import Credentials
 
 from utils.team_info import TEAM_INFO
+from utils.discord_cache import roles_by_name
+from utils.logging import get_logger
 
 load_dotenv()
 
-logger = logging.getLogger("qrls.trade")
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] %(name)s: %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-logger.setLevel(logging.INFO)
+logger = get_logger("qrls.trade")
 
 
 def _get_env_int(name: str) -> Optional[int]:
@@ -263,8 +258,9 @@ class Trade(commands.Cog):
             logger.warning("TRANSACTIONS_CHANNEL_ID does not resolve to a text channel; skipping.")
             return
 
-        role1 = discord.utils.get(guild.roles, name=team1_name)
-        role2 = discord.utils.get(guild.roles, name=team2_name)
+        guild_roles = roles_by_name(guild)
+        role1 = guild_roles.get(team1_name)
+        role2 = guild_roles.get(team2_name)
 
         team1_mention = role1.mention if role1 else f"@{team1_name}"
         team2_mention = role2.mention if role2 else f"@{team2_name}"
@@ -528,6 +524,7 @@ class Trade(commands.Cog):
                 # Swap: player1 -> team2, player2 -> team1
                 ws.update_cell(p1_row, self.cog.COL_TEAM + 1, self.expected_team2)
                 ws.update_cell(p2_row, self.cog.COL_TEAM + 1, self.expected_team1)
+                self.cog.bot.dispatch("roster_sheet_updated")
 
                 step = "UPDATE_ROLES_P1"
                 ok1, msg1 = await self.cog._apply_role_swap(
@@ -1,6 +1,5 @@
 import os
 import json
-import logging
 import traceback
 from typing import Optional
 from datetime import datetime, timedelta, timezone
@@ -14,17 +13,12 @@ import gspread
 from google.oauth2.service_account import Credentials
 
 from utils.team_info import TEAM_INFO
+from utils.logging import get_logger
 
 
 load_dotenv()
 
-logger = logging.getLogger("qrls.unretire")
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] %(name)s: %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-logger.setLevel(logging.INFO)
+logger = get_logger("qrls.unretire")
 
 DATA_DIR = "data"
 WAIVERS_FILE = os.path.join(DATA_DIR, "waivers.json")
@@ -288,26 +282,24 @@ class Unretire(commands.Cog):
         self,
         guild_id: int,
         player_id: int,
-        requested_at_iso: str,
-        expires_at_iso: str,
+        requested_at_ts: int,
+        expires_at_ts: int,
         original_team: str,
         dropped_by_id: int,
     ):
         """
-        Mirror of the drop.py behavior: record waiver timing in JSON.
-
-        Structure (by guild_id):
+        Same record drop.py writes, so waiverclaim.py handles unretire waivers too.
+        Keyed by player id; timestamps are epoch seconds (UTC):
         {
-          "123456789": [
-            {
-              "player_id": 111,
-              "requested_at": "...",
-              "expires_at": "...",
-              "original_team": "Some Team",
-              "dropped_by": 222
-            },
-            ...
-          ]
+          "111": {
+            "guild_id": 123456789,
+            "player_id": 111,
+            "requested_at": 1700000000,
+            "expires_at": 1700172800,
+            "original_team": "Some Team",
+            "dropped_by_id": 222
+          },
+          ...
         }
         """
         try:
@@ -320,35 +312,30 @@ class Unretire(commands.Cog):
                         data = json.load(f) or {}
                     except json.JSONDecodeError:
                         data = {}
-
-            gkey = str(guild_id)
-            entries = data.get(gkey, [])
-
-            # Remove existing entries for this player (if any) to avoid duplicates
-            entries = [e for e in entries if int(e.get("player_id", 0)) != int(player_id)]
-
-            entries.append(
-                {
-                    "player_id": int(player_id),
-                    "requested_at": requested_at_iso,
-                    "expires_at": expires_at_iso,
-                    "original_team": original_team,
-                    "dropped_by": int(dropped_by_id),
-                }
-            )
-
-            data[gkey] = entries
-
-            with open(WAIVERS_FILE, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            if not isinstance(data, dict):
+                data = {}
+
+            # Overwrites any existing record for this player
+            data[str(player_id)] = {
+                "guild_id": int(guild_id),
+                "player_id": int(player_id),
+                "requested_at": int(requested_at_ts),
+                "expires_at": int(expires_at_ts),
+                "original_team": original_team,
+                "dropped_by_id": int(dropped_by_id),
+            }
+
+            tmp = WAIVERS_FILE + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.replace(tmp, WAIVERS_FILE)
 
             logger.info(
                 "Recorded waiver for player %s in guild %s (expires %s).",
                 player_id,
                 guild_id,
-                expires_at_iso,
+                expires_at_ts,
             )
-
         except Exception as e:
             logger.error("Failed to record waiver json (unretire): %r", e)
             traceback.print_exc()
@@ -472,6 +459,8 @@ class Unretire(commands.Cog):
                     target_team_value,
                 )
 
+            self.bot.dispatch("roster_sheet_updated")
+
             # ----- remove Retired role (if configured) -----
             step = "REMOVE_RETIRED_ROLE"
             retired_ok, retired_msg = await self._remove_retired_role(interaction.guild, player1)
@@ -504,8 +493,8 @@ class Unretire(commands.Cog):
                     self._record_waiver(
                         guild_id=interaction.guild.id,
                         player_id=player1.id,
-                        requested_at_iso=requested_at.isoformat(),
-                        expires_at_iso=expires_at.isoformat(),
+                        requested_at_ts=int(requested_at.timestamp()),
+                        expires_at_ts=int(expires_at.timestamp()),
                         original_team=original_team or "Retired",
                         dropped_by_id=interaction.user.id,
                     )
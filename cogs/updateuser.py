@@ -1,6 +1,5 @@
 import os
 import json
-import logging
 import traceback
 from typing import Optional, Any
 
@@ -13,16 +12,11 @@ import gspread
 from google.oauth2.service_account import Credentials
 
 from utils.team_info import TEAM_INFO
+from utils.logging import get_logger
 
 load_dotenv()
 
-logger = logging.getLogger("qrls.updateuser")
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] %(name)s: %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-logger.setLevel(logging.INFO)
+logger = get_logger("qrls.updateuser")
 
 
 def _get_env_int(name: str) -> Optional[int]:
@@ -373,6 +367,7 @@ class UpdateUser(commands.Cog):
                     return
 
                 ws.update_cell(row_index, self.COL_TEAM + 1, team_name)
+                self.bot.dispatch("roster_sheet_updated")
                 updates_applied.append(f"**Team (D)** → `{team_name}`")
 
                 # Update Discord roles to match new team
@@ -1,6 +1,5 @@
 import os
 import json
-import logging
 import traceback
 from typing import Optional, Dict, Any, Tuple
 from datetime import datetime, timezone
@@ -13,17 +12,12 @@ from dotenv import load_dotenv
 import gspread
 from google.oauth2.service_account import Credentials
 
-from utils.team_info import TEAM_INFO
+from utils.team_info import get_team_role_id
+from utils.logging import get_logger
 
 load_dotenv()
 
-logger = logging.getLogger("qrls.waiverclaim")
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] %(name)s: %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-logger.setLevel(logging.INFO)
+logger = get_logger("qrls.waiverclaim")
 
 DATA_DIR = "data"
 WAIVERS_FILE = os.path.join(DATA_DIR, "waivers.json")
@@ -57,16 +51,14 @@ def _parse_iso_dt(value: str) -> Optional[datetime]:
         return None
 
 
-def _get_team_role_id(team_name: str) -> Optional[int]:
-    info = TEAM_INFO.get(team_name)
-    if not isinstance(info, dict):
-        return None
-    role_id = info.get("id")
-    if isinstance(role_id, int):
-        return role_id
-    if isinstance(role_id, str) and role_id.isdigit():
-        return int(role_id)
-    return None
+def _parse_waiver_dt(value: Any) -> Optional[datetime]:
+    """
+    Waiver timestamps are epoch seconds (drop.py, unretire.py).
+    ISO strings only appear in records written before that format; they are still read.
+    """
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    return _parse_iso_dt(str(value or ""))
 
 
 def _is_waivers_team(value: str) -> bool:
@@ -268,7 +260,7 @@ class WaiverClaim(commands.Cog):
         if not isinstance(ch, discord.TextChannel):
             return
 
-        team_role_id = _get_team_role_id(team_name)
+        team_role_id = get_team_role_id(team_name)
         team_text = f"<@&{team_role_id}>" if team_role_id else f"**{team_name}**"
         await ch.send(
             f"{team_text} has won the waiver claim for {player.mention}.",
@@ -355,6 +347,7 @@ class WaiverClaim(commands.Cog):
                 return False, "Player not found in roster sheet."
 
             roster_ws.update_cell(row, self.COL_TEAM + 1, "Free Agent")
+            self.bot.dispatch("roster_sheet_updated")
         except Exception as e:
             logger.error("Finalize to FA failed (sheet) player=%s: %r", player_id, e)
             traceback.print_exc()
@@ -363,7 +356,7 @@ class WaiverClaim(commands.Cog):
         try:
             member = guild.get_member(player_id) or await guild.fetch_member(player_id)
 
-            free_agent_role_id = _get_team_role_id("Free Agent")
+            free_agent_role_id = get_team_role_id("Free Agent")
             free_agent_role = guild.get_role(free_agent_role_id) if free_agent_role_id else None
             waivers_role = guild.get_role(self.waivers_role_id) if self.waivers_role_id else None
 
@@ -421,6 +414,7 @@ class WaiverClaim(commands.Cog):
         # Sheet update
         try:
             roster_ws.update_cell(row, self.COL_TEAM + 1, winning_team)
+            self.bot.dispatch("roster_sheet_updated")
         except Exception as e:
             logger.error("Claim award sheet update failed player=%s: %r", player_id, e)
             traceback.print_exc()
@@ -431,10 +425,10 @@ class WaiverClaim(commands.Cog):
             member = guild.get_member(player_id) or await guild.fetch_member(player_id)
 
             waivers_role = guild.get_role(self.waivers_role_id) if self.waivers_role_id else None
-            free_agent_role_id = _get_team_role_id("Free Agent")
+            free_agent_role_id = get_team_role_id("Free Agent")
             free_agent_role = guild.get_role(free_agent_role_id) if free_agent_role_id else None
 
-            team_role_id = _get_team_role_id(winning_team)
+            team_role_id = get_team_role_id(winning_team)
             if not team_role_id:
                 return False, f"Winning team role id missing/invalid in TEAM_INFO for `{winning_team}`."
             team_role = guild.get_role(team_role_id)
@@ -847,7 +841,7 @@ class WaiverClaim(commands.Cog):
                 if not isinstance(rec, dict):
                     continue
 
-                expires_at = _parse_iso_dt(str(rec.get("expires_at") or ""))
+                expires_at = _parse_waiver_dt(rec.get("expires_at"))
                 if not expires_at:
                     continue
                 if expires_at > now:
@@ -1065,7 +1059,7 @@ class WaiverClaim(commands.Cog):
                 return
 
             # Verify still not expired
-            expires_at = _parse_iso_dt(str(rec.get("expires_at") or ""))
+            expires_at = _parse_waiver_dt(rec.get("expires_at"))
             if not expires_at:
                 await interaction.followup.send("❌ Waiver record is missing/invalid `expires_at`.", ephemeral=True)
                 return
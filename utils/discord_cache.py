@@ -0,0 +1,98 @@
+# utils/discord_cache.py
+"""
+Per-guild name -> object indexes for roles, categories and text channels,
+plus the set of text channel names under each category.
+Each index is built on first use and dropped when the gateway reports a change,
+so repeated name lookups are dict hits instead of discord.utils.get scans.
+Like discord.utils.get, the first object with a given name wins.
+"""
+import discord
+from discord.ext import commands
+
+_roles_by_name: dict[int, dict[str, discord.Role]] = {}
+_categories_by_name: dict[int, dict[str, discord.CategoryChannel]] = {}
+_text_channels_by_name: dict[int, dict[str, discord.TextChannel]] = {}
+_category_channel_names: dict[int, dict[int, frozenset[str]]] = {}
+
+
+def _index_by_name(items) -> dict:
+    index = {}
+    for item in items:
+        index.setdefault(item.name, item)
+    return index
+
+
+def roles_by_name(guild: discord.Guild) -> dict[str, discord.Role]:
+    index = _roles_by_name.get(guild.id)
+    if index is None:
+        index = _roles_by_name[guild.id] = _index_by_name(guild.roles)
+    return index
+
+
+def categories_by_name(guild: discord.Guild) -> dict[str, discord.CategoryChannel]:
+    index = _categories_by_name.get(guild.id)
+    if index is None:
+        index = _categories_by_name[guild.id] = _index_by_name(guild.categories)
+    return index
+
+
+def text_channels_by_name(guild: discord.Guild) -> dict[str, discord.TextChannel]:
+    index = _text_channels_by_name.get(guild.id)
+    if index is None:
+        index = _text_channels_by_name[guild.id] = _index_by_name(guild.text_channels)
+    return index
+
+
+def category_channel_names(category: discord.CategoryChannel) -> frozenset[str]:
+    by_category = _category_channel_names.setdefault(category.guild.id, {})
+    names = by_category.get(category.id)
+    if names is None:
+        names = by_category[category.id] = frozenset(c.name for c in category.text_channels)
+    return names
+
+
+def invalidate_roles(guild: discord.Guild):
+    _roles_by_name.pop(guild.id, None)
+
+
+def invalidate_channels(guild: discord.Guild):
+    _categories_by_name.pop(guild.id, None)
+    _text_channels_by_name.pop(guild.id, None)
+    _category_channel_names.pop(guild.id, None)
+
+
+def invalidate_guild(guild: discord.Guild):
+    invalidate_roles(guild)
+    invalidate_channels(guild)
+
+
+def clear():
+    _roles_by_name.clear()
+    _categories_by_name.clear()
+    _text_channels_by_name.clear()
+    _category_channel_names.clear()
+
+
+def register(bot: commands.Bot):
+    """Hooks the gateway events that invalidate the indexes. Called once from bot.py."""
+
+    async def on_role_change(role: discord.Role, *_):
+        invalidate_roles(role.guild)
+
+    async def on_channel_change(channel: discord.abc.GuildChannel, *_):
+        invalidate_channels(channel.guild)
+
+    # Events may have been missed while disconnected, and a (re)joined guild's cache is rebuilt
+    async def on_guild_reset(guild: discord.Guild):
+        invalidate_guild(guild)
+
+    async def on_resumed():
+        clear()
+
+    for event in ("on_guild_role_create", "on_guild_role_update", "on_guild_role_delete"):
+        bot.add_listener(on_role_change, event)
+    for event in ("on_guild_channel_create", "on_guild_channel_update", "on_guild_channel_delete"):
+        bot.add_listener(on_channel_change, event)
+    for event in ("on_guild_available", "on_guild_join", "on_guild_remove"):
+        bot.add_listener(on_guild_reset, event)
+    bot.add_listener(on_resumed, "on_resumed")
@@ -0,0 +1,15 @@
+# utils/env.py
+import os
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def env_int(name: str, default: int = 0) -> int:
+    """
+    Integer setting from the environment (.env is loaded by bot.py before cogs import).
+    Parsed once per name; missing or non-numeric values fall back to `default`.
+    """
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
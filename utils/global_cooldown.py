@@ -3,6 +3,8 @@ import discord
 import os
 from dotenv import load_dotenv
 
+from utils.permissions import member_role_ids
+
 # ✅ Load .env
 load_dotenv()
 ADMINS_ROLE_ID = int(os.getenv("ADMINS_ROLE_ID", 0))
@@ -11,20 +13,17 @@ THROTTLE_SECONDS = 8.0
 _last_use_by_user: dict[int, float] = {}
 
 
-def is_admin_user(user: discord.Member) -> bool:
-    """Checks both for Admin role ID (.env) and Administrator permission."""
-    if not user.guild:
+def is_admin_user(user: discord.abc.User) -> bool:
+    """Checks both for Admin role ID (.env) and Administrator permission. Non-members (DMs) are never admins."""
+    if not isinstance(user, discord.Member):
         return False
 
     # ✅ Check for Administrator permission
-    if getattr(user, "guild_permissions", None) and user.guild_permissions.administrator:
+    if user.guild_permissions.administrator:
         return True
 
     # ✅ Check for Admin role by ID
-    if ADMINS_ROLE_ID and discord.utils.get(getattr(user, "roles", []), id=ADMINS_ROLE_ID):
-        return True
-
-    return False
+    return bool(ADMINS_ROLE_ID) and ADMINS_ROLE_ID in member_role_ids(user)
 
 
 async def check_cooldown(interaction: discord.Interaction) -> bool:
@@ -0,0 +1,33 @@
+# utils/logging.py
+import logging
+
+LOG_FORMAT = "[%(asctime)s] [%(levelname)s] %(name)s: %(message)s"
+ROOT_LOGGER_NAME = "qrls"
+
+_handler: logging.Handler | None = None
+
+
+def setup_logging(level: int = logging.INFO) -> logging.Logger:
+    """
+    Attaches the one shared console handler to the "qrls" logger.
+    Called once from bot.py; repeat calls are no-ops.
+    """
+    global _handler
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    if _handler is None:
+        _handler = logging.StreamHandler()
+        _handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        root.addHandler(_handler)
+    root.setLevel(level)
+    return root
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Returns a "qrls.*" logger whose records propagate to the shared handler.
+    Safe to call on every cog (re)load: it never stacks handlers.
+    """
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        logger.addHandler(logging.NullHandler())
+    return logger
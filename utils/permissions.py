@@ -9,6 +9,14 @@ ADMINS_ROLE_ID = int(os.getenv("ADMINS_ROLE_ID", 0))
 CAPTAINS_ROLE_ID = int(os.getenv("CAPTAINS_ROLE_ID", 0))
 
 
+def member_role_ids(member: discord.Member) -> frozenset[int]:
+    """
+    Snapshot of the member's role IDs for O(1) membership tests.
+    Build it once per handler and reuse it for every role check.
+    """
+    return frozenset(r.id for r in member.roles)
+
+
 async def has_allowed_role(interaction: discord.Interaction, allowed_roles: set[str]) -> bool:
     """
     Check if the user running the command has any of the allowed roles.
@@ -21,9 +29,10 @@ async def has_allowed_role(interaction: discord.Interaction, allowed_roles: set[
         return True
 
     # --- Check .env-based roles ---
-    if ADMINS_ROLE_ID and discord.utils.get(member.roles, id=ADMINS_ROLE_ID):
+    role_ids = member_role_ids(member)
+    if ADMINS_ROLE_ID and ADMINS_ROLE_ID in role_ids:
         return True
-    if CAPTAINS_ROLE_ID and discord.utils.get(member.roles, id=CAPTAINS_ROLE_ID):
+    if CAPTAINS_ROLE_ID and CAPTAINS_ROLE_ID in role_ids:
         return True
 
     # --- Fallback: match by role name if provided in allowed_roles ---
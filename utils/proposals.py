@@ -0,0 +1,111 @@
+# utils/proposals.py
+import asyncio
+import json
+import os
+from typing import Optional
+
+from utils.logging import get_logger
+
+# Optional: faster encoder if installed; falls back to stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = get_logger("qrls.proposals")
+
+DATA_DIR = "data"
+PROPOSALS_FILE = os.path.join(DATA_DIR, "proposals.json")
+
+FLUSH_INTERVAL_SECONDS = 5.0
+
+
+class ProposalStore:
+    """
+    In-memory copy of proposals.json shared by /propose and /confirm.
+    The file is read once; changes are written back by a background flush task.
+    File I/O runs in a worker thread so it never blocks the event loop.
+    """
+
+    def __init__(self, path: str = PROPOSALS_FILE):
+        self.path = path
+        self._data: Optional[dict] = None
+        self._dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
+        self._users = 0
+
+    def _ensure_loaded(self) -> dict:
+        if self._data is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                data = {}
+            self._data = data if isinstance(data, dict) else {}
+        return self._data
+
+    def get(self, channel_id: int) -> Optional[dict]:
+        return self._ensure_loaded().get(str(channel_id))
+
+    def set(self, channel_id: int, record: dict):
+        self._ensure_loaded()[str(channel_id)] = record
+        self._dirty = True
+
+    def pop(self, channel_id: int) -> Optional[dict]:
+        record = self._ensure_loaded().pop(str(channel_id), None)
+        if record is not None:
+            self._dirty = True
+        return record
+
+    def _write(self, data: dict):
+        # Machine-read only: compact separators keep the file small and encode faster.
+        # Write to a temp file and swap it in so a crash never leaves a partial file.
+        tmp_path = self.path + ".tmp"
+        if orjson is not None:
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps(data))
+        else:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    async def flush(self):
+        """Writes the proposals to disk if anything changed since the last flush."""
+        if not self._dirty or self._data is None:
+            return
+        # Records are replaced, never mutated, so a shallow copy is a stable snapshot
+        snapshot = dict(self._data)
+        self._dirty = False
+        try:
+            await asyncio.to_thread(self._write, snapshot)
+        except OSError:
+            self._dirty = True
+            raise
+
+    async def start(self):
+        """Called from cog_load; the flush task runs while any cog is using the store."""
+        self._users += 1
+        if self._data is None:
+            await asyncio.to_thread(os.makedirs, os.path.dirname(self.path), exist_ok=True)
+            await asyncio.to_thread(self._ensure_loaded)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Called from cog_unload; flushes pending changes once the last user is gone."""
+        self._users = max(0, self._users - 1)
+        if self._users == 0 and self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL_SECONDS)
+            try:
+                await self.flush()
+            except OSError:
+                logger.exception("Failed to write %s", self.path)
+
+
+proposals = ProposalStore()
@@ -54,3 +54,17 @@ SCHEDULE = {
 
     31: [("Arctic Assassins", "Speed Demons"),("Kings","Clarity United"),("Mustangs","Elite Ink"),("Rangers","Spectres")], #S11 Quarter Finals
 }
+
+# Team name -> channel-name slug (e.g. "Speed Demons" -> "speed-demons"), built once
+TEAM_SLUGS = {
+    team: team.lower().replace(" ", "-")
+    for matches in SCHEDULE.values()
+    for match in matches
+    for team in match
+}
+
+# Week -> [(team_a, team_b, scheduling channel name), ...], built once
+CHANNEL_NAMES = {
+    week: [(a, b, f"week{week}-{TEAM_SLUGS[a]}-vs-{TEAM_SLUGS[b]}") for a, b in matches]
+    for week, matches in SCHEDULE.items()
+}
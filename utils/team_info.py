@@ -108,3 +108,35 @@ TEAM_INFO = {
         "id": 1459792801507311677
     }
 }
+
+DEFAULT_COLOR = 0x7289DA  # Discord blurple
+DEFAULT_LOGO = "https://example.com/logos/default_team.png"  # fallback
+
+# Display fields with defaults already applied, so lookups are a single dict get
+TEAM_INFO_RESOLVED = {
+    name: {
+        "color": info.get("color", DEFAULT_COLOR),
+        "logo": info.get("logo", DEFAULT_LOGO),
+        "emoji": info.get("emoji", ""),
+    }
+    for name, info in TEAM_INFO.items()
+}
+UNASSIGNED_TEAM_INFO = {"color": DEFAULT_COLOR, "logo": DEFAULT_LOGO, "emoji": ""}
+
+# Team name <-> Discord role ID, with int/str ids normalized once (teams without a valid id are left out)
+TEAM_ROLE_IDS = {
+    name: int(info["id"])
+    for name, info in TEAM_INFO.items()
+    if isinstance(info, dict) and str(info.get("id", "")).strip().isdigit()
+}
+TEAM_NAME_BY_ROLE_ID = {role_id: name for name, role_id in TEAM_ROLE_IDS.items()}
+# Same map keyed by casefolded name, for sheet values whose casing drifts from TEAM_INFO
+TEAM_ROLE_IDS_CASEFOLD = {name.casefold(): role_id for name, role_id in TEAM_ROLE_IDS.items()}
+
+
+def get_team_role_id(team_name: str) -> int | None:
+    """Exact TEAM_INFO name first; sheet values with different casing/spacing fall back to the casefolded map."""
+    role_id = TEAM_ROLE_IDS.get(team_name)
+    if role_id is None:
+        role_id = TEAM_ROLE_IDS_CASEFOLD.get(team_name.strip().casefold())
+    return role_id